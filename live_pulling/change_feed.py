@@ -0,0 +1,228 @@
+"""
+Change feed of updated players.
+
+After each scoring run the new players_dict is diffed against the one from the
+previous run, and every player whose data changed produces one compact JSON
+event holding only the fields that changed:
+
+    {"seq": 42, "snapshot_id": 1718000000000, "tournament": "Cowbell",
+     "team": "Auburn", "player": "Jane Doe", "op": "upsert",
+     "changes": {"goals": 3, "cutter_score": 12, "price": 14}}
+
+Players that disappear produce an "op": "delete" event. Events are fanned out
+to:
+    - the feed file (JSON lines, CHANGE_FEED_DIR/changes.jsonl)
+    - a local Unix socket, when CHANGE_FEED_SOCKET names one a consumer listens on
+    - GET /changes on read_api.py (Server-Sent Events tailing the feed file)
+
+Environment:
+    CHANGE_FEED_DIR: Where the feed file and last published players are kept
+                     (defaults to live_pulling/change_feed)
+    CHANGE_FEED_SOCKET: Optional Unix socket path to push events to
+    CHANGE_FEED_MAX_BYTES: Feed file size before it is rotated to changes.jsonl.1
+                           (defaults to 50 MB)
+"""
+
+import hashlib
+import json
+import os
+import socket
+from pathlib import Path
+
+CHANGE_FEED_DIR = Path(
+    os.getenv("CHANGE_FEED_DIR", Path(__file__).resolve().parent / "change_feed")
+)
+CHANGE_FEED_SOCKET = os.getenv("CHANGE_FEED_SOCKET")
+CHANGE_FEED_MAX_BYTES = int(os.getenv("CHANGE_FEED_MAX_BYTES", str(50 * 1024 * 1024)))
+
+FEED_FILENAME = "changes.jsonl"
+
+SOCKET_TIMEOUT_SECONDS = 2
+
+
+def feed_path(feed_dir=CHANGE_FEED_DIR):
+    """Path of the JSON-lines feed file."""
+    return Path(feed_dir) / FEED_FILENAME
+
+
+def flatten_player(data):
+    """
+    One player's data as a flat record of the fields consumers see.
+
+    Scores are lifted to the top level (captain_score, ...) and tournaments use
+    the same key as the read API.
+    """
+    record = {}
+    for key, value in data.items():
+        if key == "scores":
+            record.update(value)
+        elif key == "tournamemnts":
+            record["tournaments"] = value
+        else:
+            record[key] = value
+    return record
+
+
+def diff_players(previous, players_dict):
+    """
+    Per-player changes between two runs.
+
+    Args:
+        previous: {team: {player: flat record}} from the last run
+        players_dict: New scored players data
+
+    Returns:
+        Tuple of (list of (team, player, op, changes), new {team: {player: flat record}})
+    """
+    current = {}
+    changes = []
+    for team_name, players in players_dict.items():
+        current[team_name] = {}
+        old_team = previous.get(team_name, {})
+        for player_name, data in players.items():
+            # JSON round trip so values compare the same way they were stored
+            record = json.loads(json.dumps(flatten_player(data)))
+            current[team_name][player_name] = record
+
+            old_record = old_team.get(player_name)
+            if old_record is None:
+                changed = record
+            else:
+                changed = {
+                    field: value
+                    for field, value in record.items()
+                    if field not in old_record or old_record[field] != value
+                }
+            if changed:
+                changes.append((team_name, player_name, "upsert", changed))
+
+    for team_name, players in previous.items():
+        for player_name in players:
+            if player_name not in current.get(team_name, {}):
+                changes.append((team_name, player_name, "delete", {}))
+
+    return changes, current
+
+
+def _last_players_path(feed_dir, tournament_name):
+    digest = hashlib.sha1(tournament_name.encode("utf-8")).hexdigest()[:16]
+    return Path(feed_dir) / f"last_{digest}.json"
+
+
+def _load_json(path, default):
+    if not path.exists():
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def send_to_socket(socket_path, payload):
+    """
+    Push encoded events to a consumer listening on a Unix socket.
+
+    Returns:
+        True if delivered; False if nobody is listening
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(SOCKET_TIMEOUT_SECONDS)
+            sock.connect(str(socket_path))
+            sock.sendall(payload)
+        return True
+    except OSError:
+        return False
+
+
+def publish_changes(
+    players_dict,
+    tournament_name,
+    snapshot_id,
+    feed_dir=CHANGE_FEED_DIR,
+    socket_path=CHANGE_FEED_SOCKET,
+):
+    """
+    Diff players_dict against the last published run and emit change events.
+
+    Args:
+        players_dict: Scored and priced players data
+        tournament_name: Tournament the data belongs to
+        snapshot_id: Snapshot id the changes lead to
+        feed_dir: Directory of the feed file and feed state
+        socket_path: Optional Unix socket to push the events to
+
+    Returns:
+        Number of events emitted
+    """
+    feed_dir = Path(feed_dir)
+    feed_dir.mkdir(parents=True, exist_ok=True)
+
+    last_path = _last_players_path(feed_dir, tournament_name)
+    changes, current = diff_players(_load_json(last_path, {}), players_dict)
+
+    if changes:
+        state_path = feed_dir / "feed_state.json"
+        feed_state = _load_json(state_path, {"seq": 0})
+
+        lines = []
+        for team_name, player_name, op, changed in changes:
+            feed_state["seq"] += 1
+            event = {
+                "seq": feed_state["seq"],
+                "snapshot_id": snapshot_id,
+                "tournament": tournament_name,
+                "team": team_name,
+                "player": player_name,
+                "op": op,
+                "changes": changed,
+            }
+            lines.append(json.dumps(event, separators=(",", ":")))
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+        path = feed_path(feed_dir)
+        if path.exists() and path.stat().st_size + len(payload) > CHANGE_FEED_MAX_BYTES:
+            os.replace(path, path.with_name(FEED_FILENAME + ".1"))
+        with open(path, "ab") as f:
+            f.write(payload)
+        _write_json(state_path, feed_state)
+
+        if socket_path and not send_to_socket(socket_path, payload):
+            print(f"  ⚠ No change feed consumer listening on {socket_path}")
+
+    # Saved last, so a failed run re-emits its changes next time
+    _write_json(last_path, current)
+    return len(changes)
+
+
+def read_new_events(path, offset):
+    """
+    Complete event lines appended to the feed file since offset.
+
+    A file that shrank (rotated) is read again from the start.
+
+    Returns:
+        Tuple of (list of event line bytes, new offset)
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return [], 0
+    if size < offset:
+        offset = 0
+    if size == offset:
+        return [], offset
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(size - offset)
+
+    # Leave a partially written last line for the next read
+    end = data.rfind(b"\n") + 1
+    lines = [line for line in data[:end].split(b"\n") if line]
+    return lines, offset + end
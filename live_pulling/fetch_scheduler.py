@@ -0,0 +1,286 @@
+"""
+Rate-limited, prioritized downloads of the UltiAnalytics team exports.
+
+Each run checks every team, fetching the teams most likely to have new data
+first: teams with a game today or an export that changed recently, then the
+rest, and teams that have not changed in hours last. Unchanged exports come
+back as cheap 304s and are served from the local cache of the last export.
+
+Requests go through a token bucket (FETCH_RATE_PER_SECOND, FETCH_BURST), use
+conditional GETs (ETag / Last-Modified) so unchanged exports come back as
+304s, and 429/503 responses are retried after their Retry-After delay, which
+also pauses every other request.
+
+Environment:
+    FETCH_RATE_PER_SECOND: Sustained request rate (defaults to 1)
+    FETCH_BURST: Requests allowed back to back before the rate applies (defaults to 4)
+    FETCH_STATE_DIR: Where per-team state and cached exports are kept
+                     (defaults to live_pulling/fetch_cache)
+"""
+
+import csv
+import hashlib
+import heapq
+import json
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import StringIO
+from pathlib import Path
+
+import requests
+
+FETCH_RATE_PER_SECOND = float(os.getenv("FETCH_RATE_PER_SECOND", "1"))
+FETCH_BURST = int(os.getenv("FETCH_BURST", "4"))
+FETCH_STATE_DIR = Path(
+    os.getenv("FETCH_STATE_DIR", Path(__file__).resolve().parent / "fetch_cache")
+)
+
+# Priorities, lowest is fetched first
+PRIORITY_ACTIVE = 0  # game today, or export changed in the last ACTIVE_WINDOW_SECONDS
+PRIORITY_NORMAL = 1  # changed within IDLE_AFTER_SECONDS, or never fetched
+PRIORITY_IDLE = 2    # unchanged for longer
+
+ACTIVE_WINDOW_SECONDS = 2 * 60 * 60
+IDLE_AFTER_SECONDS = 6 * 60 * 60
+
+# Throttled responses are retried this many times per team
+MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER_SECONDS = 30
+MAX_RETRY_AFTER_SECONDS = 300
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+def create_token_bucket(rate=FETCH_RATE_PER_SECOND, capacity=FETCH_BURST):
+    """Token bucket allowing `capacity` requests at once and `rate` per second after."""
+    return {
+        "rate": rate,
+        "capacity": capacity,
+        "tokens": float(capacity),
+        "updated": time.monotonic(),
+        "paused_until": 0.0,
+    }
+
+
+def take_token(bucket):
+    """Block until a request may be sent."""
+    while True:
+        now = time.monotonic()
+        if now < bucket["paused_until"]:
+            time.sleep(bucket["paused_until"] - now)
+            continue
+
+        bucket["tokens"] = min(
+            bucket["capacity"], bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"]
+        )
+        bucket["updated"] = now
+        if bucket["tokens"] >= 1:
+            bucket["tokens"] -= 1
+            return
+        time.sleep((1 - bucket["tokens"]) / bucket["rate"])
+
+
+def pause_bucket(bucket, seconds):
+    """Hold every request for `seconds` (the server asked us to back off)."""
+    bucket["paused_until"] = max(bucket["paused_until"], time.monotonic() + seconds)
+    bucket["tokens"] = 0.0
+
+
+def retry_after_seconds(response):
+    """Delay requested by a Retry-After header (seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return DEFAULT_RETRY_AFTER_SECONDS
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER_SECONDS
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+def load_fetch_state(state_dir=FETCH_STATE_DIR):
+    """Per-team fetch state from the last runs ({} on first run)."""
+    path = Path(state_dir) / "state.json"
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_fetch_state(state, state_dir=FETCH_STATE_DIR):
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_dir / "state.json.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_dir / "state.json")
+
+
+def _cache_path(state_dir, team_name):
+    digest = hashlib.sha1(team_name.encode("utf-8")).hexdigest()[:16]
+    return Path(state_dir) / f"{digest}.csv"
+
+
+def read_cached_export(team_name, state_dir=FETCH_STATE_DIR):
+    """Last downloaded export of a team, or None."""
+    path = _cache_path(state_dir, team_name)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def _write_cached_export(team_name, csv_content, state_dir):
+    path = _cache_path(state_dir, team_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(csv_content)
+    os.replace(tmp_path, path)
+
+
+def latest_game_date(csv_content):
+    """Most recent game date (YYYY-MM-DD) in an export, or ""."""
+    latest = ""
+    for row in csv.DictReader(StringIO(csv_content)):
+        game_date = row.get("Date/Time", "")[:10]
+        if game_date > latest:
+            latest = game_date
+    return latest
+
+
+def team_priority(team_state, now):
+    """
+    Fetch priority of a team (lower is fetched first).
+
+    Idle teams are only fetched last, never skipped: "game today" is judged
+    from the cached export, so a team starting a new tournament day after a
+    quiet spell is still idle until its new export has been fetched.
+    """
+    if not team_state or not team_state.get("last_checked"):
+        return PRIORITY_NORMAL
+
+    today = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+    changed_ago = now - team_state.get("last_changed", 0)
+    if team_state.get("last_game_date") == today or changed_ago < ACTIVE_WINDOW_SECONDS:
+        return PRIORITY_ACTIVE
+    if changed_ago < IDLE_AFTER_SECONDS:
+        return PRIORITY_NORMAL
+    return PRIORITY_IDLE
+
+
+def _conditional_headers(team_state):
+    headers = {}
+    if team_state.get("etag"):
+        headers["If-None-Match"] = team_state["etag"]
+    if team_state.get("last_modified"):
+        headers["If-Modified-Since"] = team_state["last_modified"]
+    return headers
+
+
+def fetch_team_exports(export_urls, state_dir=FETCH_STATE_DIR, bucket=None, session=None):
+    """
+    Download every team export, in priority order.
+
+    Teams that return 304 or fail to download fall back to their cached
+    export, so the result covers every team that has ever been fetched.
+
+    Args:
+        export_urls: {team_name: export_url}
+        state_dir: Directory for the fetch state and cached exports
+        bucket: Token bucket shared by the requests (created if omitted)
+        session: requests.Session to reuse connections (created if omitted)
+
+    Returns:
+        Dictionary of {team_name: csv_content}, in export_urls order whatever
+        order the downloads ran in
+    """
+    state = load_fetch_state(state_dir)
+    bucket = bucket or create_token_bucket()
+    session = session or requests.Session()
+    now = time.time()
+
+    queue = []
+    csv_data_dict = {}
+    for order, (team_name, export_url) in enumerate(export_urls.items()):
+        team_state = state.get(team_name, {})
+        if team_state.get("url") != export_url:
+            team_state = {}  # URL changed: start over
+        priority = team_priority(team_state, now)
+        heapq.heappush(queue, (priority, team_state.get("last_checked", 0), order, team_name, 0))
+
+    fetched = not_modified = 0
+    while queue:
+        priority, last_checked, order, team_name, attempt = heapq.heappop(queue)
+        export_url = export_urls[team_name]
+        team_state = state.get(team_name, {})
+        if team_state.get("url") != export_url:
+            team_state = {"url": export_url}
+        cached = read_cached_export(team_name, state_dir)
+
+        take_token(bucket)
+        print(f"Downloading CSV for {team_name} from {export_url}...")
+        headers = _conditional_headers(team_state) if cached is not None else {}
+        try:
+            response = session.get(export_url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+        except requests.exceptions.RequestException as e:
+            print(f"Error downloading CSV for {team_name}: {e}")
+            response = None
+
+        if response is not None and response.status_code in (429, 503):
+            delay = retry_after_seconds(response)
+            pause_bucket(bucket, delay)
+            if attempt < MAX_RETRIES:
+                print(f"  ⚠ {team_name}: throttled ({response.status_code}), retrying in {delay:.0f}s")
+                heapq.heappush(queue, (priority, last_checked, order, team_name, attempt + 1))
+                continue
+            print(f"  ✗ {team_name}: still throttled after {MAX_RETRIES} retries")
+            response = None
+
+        checked_at = time.time()
+        if response is not None and response.status_code == 304 and cached is not None:
+            team_state["last_checked"] = checked_at
+            csv_data_dict[team_name] = cached
+            not_modified += 1
+            print(f"✓ {team_name} unchanged since last fetch (304)")
+        elif response is not None and response.ok:
+            content_type = response.headers.get("content-type", "").lower()
+            if "csv" not in content_type and "text" not in content_type:
+                print(f"Warning: Unexpected content type: {content_type}")
+
+            csv_content = response.text
+            content_hash = hashlib.sha1(csv_content.encode("utf-8")).hexdigest()
+            if content_hash != team_state.get("content_hash"):
+                team_state["content_hash"] = content_hash
+                team_state["last_changed"] = checked_at
+                team_state["last_game_date"] = latest_game_date(csv_content)
+                _write_cached_export(team_name, csv_content, state_dir)
+            team_state["etag"] = response.headers.get("ETag")
+            team_state["last_modified"] = response.headers.get("Last-Modified")
+            team_state["last_checked"] = checked_at
+            csv_data_dict[team_name] = csv_content
+            fetched += 1
+            print(f"✓ Successfully downloaded CSV for {team_name} ({len(csv_content)} bytes)")
+        else:
+            if response is not None:
+                print(f"Error downloading CSV for {team_name}: HTTP {response.status_code}")
+            if cached is not None:
+                csv_data_dict[team_name] = cached
+                print(f"  ⚠ Using cached export for {team_name}")
+
+        team_state["url"] = export_url
+        state[team_name] = team_state
+
+    save_fetch_state(state, state_dir)
+    print(
+        f"Fetched {fetched} export(s), {not_modified} unchanged, "
+        f"{len(export_urls) - fetched - not_modified} served from cache or failed"
+    )
+    # Downloads run in priority order, but callers number players in the
+    # order teams come back, so return them in export_urls order
+    return {name: csv_data_dict[name] for name in export_urls if name in csv_data_dict}
@@ -6,6 +6,8 @@ Usage:
     1. Add UltiAnalytics CSV export URLs to ULTIANALYTICS_EXPORT_URLS dictionary
     2. Install dependencies: pip install -r requirements.txt
     3. Run script: python pull_data.py
+       (add --profile for per-stage cProfile/tracemalloc reports in profiles/,
+        --fresh to ignore the warm-start checkpoint)
 
 For GitHub Actions:
     - No browser installation needed (uses direct HTTP requests)
@@ -16,10 +18,11 @@ For GitHub Actions:
 import os
 import sys
 import csv
+import threading
+import time
 from pathlib import Path
 from io import StringIO
 from typing import Optional
-import requests
 from supabase import create_client, Client
 import gspread
 from google.oauth2.service_account import Credentials
@@ -45,7 +48,40 @@ from utils.calculations import (
     calculate_all_scores,
     calculate_players_prices,
     filter_csv_by_tournaments,
+    open_warehouse,
+    list_warehouse_tournaments,
+    ingest_team_events,
+    set_players_stats_from_warehouse,
+    create_identity_index,
+    load_player_aliases,
+    resolve_csv_names,
+    set_player_ids,
+    profiling_requested,
+    create_profiler,
+    profile_stage,
+    write_profile_summary,
+    build_search_index,
+    load_decayed_aggregator,
+    update_decayed_stats,
+    apply_decayed_stats,
+    DECAYED_STATS_KEY,
+    save_decayed_aggregator,
+    input_hash,
+    file_input_hash,
+    save_checkpoint,
+    load_checkpoint,
+    checkpoint_entry,
+    interned_names,
+    restore_interned_names,
+    summarize_games,
+    reconcile_games,
+    describe_game_issue,
 )
+from read_api import write_snapshot_file
+from fetch_scheduler import fetch_team_exports
+from change_feed import publish_changes, feed_path
+from supabase_bulk import bulk_upsert
+from sheets_publisher import publish_sheets
 
 # Hardcoded list of UltiAnalytics team CSV export URLs
 # Format: {team_name: export_url}
@@ -61,6 +97,56 @@ TOURNAMENT_SEARCH_TERM = "cow"  # Will match: Cowbell, cowbell, Cowbell2025, ala
 # Hardcoded tournament name for Supabase
 TOURNAMENT_NAME = "Cowbell"
 
+# Optional local event warehouse (SQLite file). When WAREHOUSE_PATH is set, every
+# download is ingested into it and stats are read back through indexed queries,
+# so the event history is kept across runs and seasons.
+WAREHOUSE_PATH = os.getenv("WAREHOUSE_PATH")
+
+# Optional alias table merging different spellings of the same player
+# (JSON list of {"team", "alias", "player", "player_team"} entries)
+PLAYER_ALIASES_PATH = Path(os.getenv("PLAYER_ALIASES_PATH", project_root / "player_aliases.json"))
+
+# Basis for scores and prices: "tournament" counts the matching tournaments'
+# events equally; "decayed" uses exponentially decayed totals over every
+# tournament and season in the exports, so recent form weighs more.
+# DECAY_BY is "date" (half-life in days) or "tournament" (half-life in tournaments).
+PRICE_BASIS = os.getenv("PRICE_BASIS", "tournament")
+DECAY_BY = os.getenv("DECAY_BY", "date")
+DECAY_HALF_LIFE = float(os.getenv("DECAY_HALF_LIFE", "60"))
+DECAYED_STATS_PATH = Path(
+    os.getenv("DECAYED_STATS_PATH", Path(__file__).resolve().parent / "decayed_stats.json")
+)
+
+# Warm-start checkpoint: teams whose export is byte-identical to the last run
+# reuse their processed players instead of being parsed and aggregated again.
+# python pull_data.py --fresh ignores it.
+PULL_CHECKPOINT_PATH = Path(
+    os.getenv("PULL_CHECKPOINT_PATH", Path(__file__).resolve().parent / "pull_checkpoint.ffck")
+)
+
+# What to do when the two teams' copies of a game disagree on the final score,
+# or a tracked team's export is missing a game its opponent recorded:
+# "warn" (default) logs them and publishes anyway; "hold" publishes nothing,
+# leaving the previous prices live until the exports are fixed.
+GAME_MISMATCH_POLICY = os.getenv("GAME_MISMATCH_POLICY", "warn")
+
+# Supabase tables: rows are written under a snapshot id, and readers follow the
+# per-tournament pointer (through the live_scores_current view)
+LIVE_SCORES_TABLE = "live_scores"
+CURRENT_SNAPSHOT_TABLE = "live_scores_current_snapshot"
+
+# Unique key of live_scores rows; bulk writes upsert on it so retried chunks are idempotent
+LIVE_SCORES_CONFLICT_KEY = "tournament_name,snapshot_id,team,player"
+
+# Database function moving a tournament's snapshot pointer forward (see supabase_schema.sql)
+PUBLISH_SNAPSHOT_FUNCTION = "publish_live_scores_snapshot"
+
+# Database function refreshing the summary materialized views (see supabase_schema.sql)
+SUMMARIES_REFRESH_FUNCTION = "refresh_live_scores_summaries"
+
+# Background threads deleting superseded snapshots (joined before exit)
+_snapshot_gc_threads = []
+
 def get_supabase_client() -> Optional[Client]:
     """
     Initialize and return Supabase client using environment variables.
@@ -81,44 +167,7 @@ def get_supabase_client() -> Optional[Client]:
     return create_client(supabase_url, supabase_key)
 
 
-def download_csv_to_memory(export_url, team_name):
-    """
-    Download CSV data directly from UltiAnalytics export URL into memory.
-    
-    Args:
-        export_url: Direct CSV export URL from UltiAnalytics
-        team_name: Name of the team (for logging)
-        
-    Returns:
-        CSV content as string, or None if failed
-    """
-    try:
-        print(f"Downloading CSV for {team_name} from {export_url}...")
-        
-        # Download CSV directly using requests
-        response = requests.get(export_url, timeout=30)
-        response.raise_for_status()
-        
-        # Check if response is CSV
-        content_type = response.headers.get('content-type', '').lower()
-        if 'csv' not in content_type and 'text' not in content_type:
-            print(f"Warning: Unexpected content type: {content_type}")
-        
-        # Decode content to string (assuming UTF-8 encoding)
-        csv_content = response.text
-        
-        print(f"✓ Successfully downloaded CSV for {team_name} ({len(csv_content)} bytes)")
-        return csv_content
-        
-    except requests.exceptions.RequestException as e:
-        print(f"Error downloading CSV for {team_name}: {e}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error downloading CSV for {team_name}: {e}")
-        return None
-
-
-def set_players_and_teams_from_content(csv_content, players_dict, team_name):
+def set_players_and_teams_from_content(csv_content, players_dict, team_name, identity_index=None):
     """
     Wrapper function to set players and teams from CSV content in memory.
     
@@ -126,6 +175,8 @@ def set_players_and_teams_from_content(csv_content, players_dict, team_name):
         csv_content: CSV content as string
         players_dict: Dictionary to update
         team_name: Name of the team
+        identity_index: Optional player identity index; names in the rows are
+                        rewritten to each player's canonical spelling
         
     Returns:
         Tuple of (updated players_dict, list of CSV rows)
@@ -133,6 +184,9 @@ def set_players_and_teams_from_content(csv_content, players_dict, team_name):
     csv_file = StringIO(csv_content)
     whole_csv = list(csv.DictReader(csv_file))
     
+    if identity_index is not None:
+        resolve_csv_names(identity_index, team_name, whole_csv)
+    
     if team_name not in players_dict:
         players_dict[team_name] = {}
     
@@ -168,12 +222,21 @@ def collect_tournaments_from_content(csv_content):
     return sorted(list(tournaments))
 
 
-def process_csv_data_in_memory(csv_data_dict):
+def process_csv_data_in_memory(
+    csv_data_dict, warehouse=None, identity_index=None, decayed=None, game_summaries=None
+):
     """
     Process CSV data from memory and filter for Cowbell tournament.
     
     Args:
         csv_data_dict: Dictionary mapping team_name to CSV content string
+        warehouse: Optional warehouse connection (see open_warehouse); when given,
+                   rows are ingested into it and stats are read from it
+        identity_index: Optional player identity index used to merge name spellings
+        decayed: Optional decayed stats aggregator; every team's rows (all
+                 tournaments) are streamed into it
+        game_summaries: Optional dictionary filled with each team's
+                        summarize_games (all tournaments), for reconcile_games
         
     Returns:
         Dictionary of players data filtered for Cowbell tournament
@@ -191,9 +254,16 @@ def process_csv_data_in_memory(csv_data_dict):
         try:
             # Set players and teams from CSV content
             players_dict, whole_csv = set_players_and_teams_from_content(
-                csv_content, players_dict, team_name
+                csv_content, players_dict, team_name, identity_index
             )
             
+            if decayed is not None:
+                new_rows = update_decayed_stats(decayed, team_name, whole_csv)
+                print(f"  Streamed {new_rows} new row(s) into the decayed stats")
+            
+            if game_summaries is not None:
+                game_summaries[team_name] = summarize_games(whole_csv)
+            
             # Collect tournaments and filter for tournaments containing "cow" (case-insensitive)
             team_tournaments = collect_tournaments_from_content(csv_content)
             
@@ -216,6 +286,18 @@ def process_csv_data_in_memory(csv_data_dict):
             
             selected_tournaments = matching_tournaments
             
+            if warehouse is not None:
+                # The warehouse keys events by the names as written in the
+                # export, so it is fed the rows before alias resolution
+                raw_csv = list(csv.DictReader(StringIO(csv_content)))
+                new_events = ingest_team_events(warehouse, team_name, raw_csv)
+                print(f"  Stored {new_events} new event(s) in the warehouse")
+                players_dict = set_players_stats_from_warehouse(
+                    players_dict, team_name, warehouse, selected_tournaments,
+                    identity_index=identity_index,
+                )
+                continue
+            
             # Filter CSV data to include all tournaments containing "cow"
             # This will combine stats from multiple tournaments (e.g., "cowbell" and "cowbell classic")
             filtered_csv = filter_csv_by_tournaments(whole_csv, selected_tournaments)
@@ -242,6 +324,72 @@ def process_csv_data_in_memory(csv_data_dict):
     return players_dict
 
 
+def decayed_digest(decayed, team_name):
+    """Watermark digest of the rows a team streamed into the decayed stats, or None."""
+    if decayed is None:
+        return None
+    return decayed["teams"].get(team_name, {}).get("digest")
+
+
+def checkpoint_entry_in_stores(entry, team_name, warehouse=None, decayed=None):
+    """
+    Whether a team restored from the checkpoint is also in the stores it is
+    scored from. Reused teams skip warehouse ingest and decayed streaming, so
+    a deleted warehouse file or a reset decayed aggregator (new half-life,
+    key or deleted state file) means the team must be processed again.
+    
+    Args:
+        entry: Checkpoint entry of the team
+        team_name: Team name
+        warehouse: Optional warehouse connection
+        decayed: Optional decayed stats aggregator
+        
+    Returns:
+        True if the entry can be reused as is
+    """
+    if decayed is not None and decayed_digest(decayed, team_name) != entry.get("decayed_digest"):
+        return False
+    # Teams without a matching tournament are never ingested, so only check the others
+    if warehouse is not None and entry["players"] and not list_warehouse_tournaments(warehouse, team_name):
+        return False
+    return True
+
+
+def check_mirrored_games(game_summaries):
+    """
+    Reconcile both teams' copies of each game in the matching tournaments and
+    log score mismatches and games missing from a tracked team's export.
+    
+    Args:
+        game_summaries: Dictionary of {team_name: summarize_games(...)}
+        
+    Returns:
+        Number of mismatched or missing games
+    """
+    report = reconcile_games(game_summaries)
+    
+    def matching(items):
+        return [
+            item for item in items
+            if TOURNAMENT_SEARCH_TERM.lower() in item["tournament"].lower()
+        ]
+    
+    matched = matching(report["matched"])
+    mismatched = matching(report["mismatched"])
+    missing = matching(report["missing"])
+    untracked = matching(report["untracked"])
+    
+    print(f"\nReconciled games: {len(matched)} matched, {len(mismatched)} mismatched, "
+          f"{len(missing)} missing, {len(untracked)} against untracked opponents")
+    for issue in mismatched:
+        print(f"  ⚠ Score mismatch: {describe_game_issue(issue)}")
+    for issue in missing:
+        game = next(iter(issue["games"].values()))
+        print(f"  ⚠ Missing upload: {game['opponent']} has no copy of "
+              f"{describe_game_issue(issue)}")
+    return len(mismatched) + len(missing)
+
+
 def filter_players_for_cowbell(players_dict):
     """
     Filter players_dict to only include players who have a tournament containing "cow".
@@ -318,6 +466,10 @@ def output_to_google_sheets(players_dict, sheet_id=None, worksheet_name=None):
     """
     Write player stats and scores to Google Sheets.
     
+    Besides the main worksheet with every player, a leaderboard tab and one tab
+    per tournament and per team are kept up to date (see sheets_publisher.py),
+    all in one batch update per run.
+    
     Args:
         players_dict: Dictionary of players data
         sheet_id: Google Sheet ID (from URL or env var GOOGLE_SHEET_ID)
@@ -358,58 +510,14 @@ def output_to_google_sheets(players_dict, sheet_id=None, worksheet_name=None):
         # Open the spreadsheet
         spreadsheet = client.open_by_key(sheet_id)
         
-        # Get or create the worksheet
-        try:
-            worksheet = spreadsheet.worksheet(worksheet_name)
-        except gspread.exceptions.WorksheetNotFound:
-            print(f"  Creating new worksheet '{worksheet_name}'...")
-            worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=1000, cols=20)
+        # All tabs (all players, leaderboard, per tournament, per team) are
+        # sized and written in a single batch update
+        print("\nWriting player records to Google Sheets...")
+        tab_count, main_rows = publish_sheets(spreadsheet, players_dict, worksheet_name)
         
-        # Prepare header row
-        headers = [
-            "Team",
-            "Player",
-            "Goals",
-            "Assists",
-            "Ds",
-            "Turnovers",
-            "Captain Score",
-            "Handler Score",
-            "Cutter Score",
-            "Defender Score"
-        ]
-        
-        # Prepare data rows
-        rows = [headers]
-        
-        for team_name, players in players_dict.items():
-            for player_name, data in players.items():
-                scores = data.get("scores", {})
-                
-                row = [
-                    team_name,
-                    player_name,
-                    data.get("goals", 0),
-                    data.get("assists", 0),
-                    data.get("ds", 0),
-                    data.get("turnovers", 0),
-                    scores.get("captain_score", 0),
-                    scores.get("handler_score", 0),
-                    scores.get("cutter_score", 0),
-                    scores.get("defender_score", 0),
-                ]
-                rows.append(row)
-        
-        # Clear existing data and write new data
-        print(f"\nWriting {len(rows) - 1} player record(s) to Google Sheets...")
-        worksheet.clear()
-        worksheet.update('A1', rows, value_input_option='RAW')
-        
-        # Format header row (make it bold)
-        worksheet.format('A1:J1', {'textFormat': {'bold': True}})
-        
-        print(f"✓ Successfully wrote {len(rows)} row(s) (including header) to Google Sheets")
-        return len(rows)
+        print(f"✓ Successfully wrote {main_rows} row(s) (including header) to '{worksheet_name}' "
+              f"and {tab_count - 1} other tab(s) in Google Sheets")
+        return main_rows
         
     except Exception as e:
         print(f"\n✗ Error updating Google Sheets: {e}")
@@ -418,14 +526,142 @@ def output_to_google_sheets(players_dict, sheet_id=None, worksheet_name=None):
         return 0
 
 
-def output_to_supabase(players_dict, tournament_name=TOURNAMENT_NAME):
+def new_snapshot_id():
+    """
+    Create a snapshot id for a new set of live_scores rows.
+    
+    Ids are millisecond timestamps, so later snapshots always sort after earlier ones.
+    
+    Returns:
+        Snapshot id as an integer
+    """
+    return time.time_ns() // 1_000_000
+
+
+def publish_snapshot(supabase, tournament_name, snapshot_id):
+    """
+    Point readers of a tournament at a fully written snapshot.
+    
+    Calls the publish_live_scores_snapshot database function, which moves the
+    pointer in one statement and only forward: a run that finishes after a
+    newer run has already published cannot point readers back at its older
+    snapshot (which the newer run's garbage collection may have deleted).
+    
+    Args:
+        supabase: Supabase client
+        tournament_name: Tournament whose pointer should move
+        snapshot_id: Snapshot id that was just written
+        
+    Returns:
+        Tuple of (previous snapshot id or None, current snapshot id); the
+        current id is not snapshot_id if a newer snapshot was already published
+    """
+    response = supabase.rpc(
+        PUBLISH_SNAPSHOT_FUNCTION,
+        {"p_tournament_name": tournament_name, "p_snapshot_id": snapshot_id},
+    ).execute()
+    row = response.data[0] if isinstance(response.data, list) else response.data
+    return row["previous_snapshot_id"], row["current_snapshot_id"]
+
+
+def garbage_collect_snapshots(supabase, tournament_name, keep_from_snapshot_id):
+    """
+    Delete snapshots of a tournament that are older than keep_from_snapshot_id.
+    
+    Callers pass the snapshot that was current before their publish, so the
+    current and the previous snapshot are always kept, as is any newer
+    snapshot another run is still writing.
+    
+    Args:
+        supabase: Supabase client
+        tournament_name: Tournament to clean up
+        keep_from_snapshot_id: Oldest snapshot id to keep
+        
+    Returns:
+        Number of deleted records
+    """
+    try:
+        delete_response = (
+            supabase.table(LIVE_SCORES_TABLE)
+            .delete()
+            .eq("tournament_name", tournament_name)
+            .lt("snapshot_id", keep_from_snapshot_id)
+            .execute()
+        )
+        deleted_count = len(delete_response.data) if delete_response.data else 0
+        print(f"  Garbage-collected {deleted_count} record(s) from old snapshots of '{tournament_name}'")
+        return deleted_count
+    except Exception as e:
+        print(f"\n⚠ Warning: Error garbage-collecting old snapshots: {e}")
+        return 0
+
+
+def start_snapshot_gc(supabase, tournament_name, keep_from_snapshot_id):
+    """
+    Garbage-collect snapshots older than keep_from_snapshot_id in a background thread.
+    
+    Readers already see the new snapshot, so the pull script does not need to
+    wait for the delete. Call wait_for_snapshot_gc() before exiting.
+    
+    Returns:
+        The started thread
+    """
+    thread = threading.Thread(
+        target=garbage_collect_snapshots,
+        args=(supabase, tournament_name, keep_from_snapshot_id),
+        name=f"snapshot-gc-{tournament_name}",
+    )
+    thread.start()
+    _snapshot_gc_threads.append(thread)
+    return thread
+
+
+def wait_for_snapshot_gc():
+    """Wait for background snapshot garbage collection to finish."""
+    while _snapshot_gc_threads:
+        _snapshot_gc_threads.pop().join()
+
+
+def refresh_summaries(supabase):
+    """
+    Refresh the team, tournament and role-distribution summary views.
+    
+    The views are refreshed concurrently inside the database, so pages reading
+    them keep being served while they update. A failure is only a warning: the
+    views keep their previous contents until the next run.
+    
+    Args:
+        supabase: Supabase client
+        
+    Returns:
+        True if the views were refreshed
+    """
+    try:
+        supabase.rpc(SUMMARIES_REFRESH_FUNCTION).execute()
+        print("✓ Refreshed summary views")
+        return True
+    except Exception as e:
+        print(f"⚠ Warning: Could not refresh summary views: {e}")
+        print(f"  Run the latest supabase_schema.sql to create {SUMMARIES_REFRESH_FUNCTION}()")
+        return False
+
+
+def output_to_supabase(players_dict, tournament_name=TOURNAMENT_NAME, snapshot_id=None):
     """
     Update Supabase live_scores table with players data.
-    Replaces all existing data for the given tournament name.
+    Writes a new snapshot for the given tournament name, then points readers at it.
+    
+    The new rows are inserted under a fresh snapshot id while readers keep seeing
+    the previous snapshot through the live_scores_current view. Once the insert
+    succeeds, the tournament's pointer is flipped in one statement and the old
+    snapshots are deleted in the background. If the insert fails, the pointer is
+    left alone and the partial snapshot is removed.
     
     Args:
         players_dict: Dictionary of players data
         tournament_name: Tournament name to use (defaults to "Cowbell")
+        snapshot_id: Snapshot id of this run, shared with the change feed and the
+                     read API snapshot (a new one is created if omitted)
         
     Returns:
         Number of records updated/inserted (0 if Supabase is not configured)
@@ -440,6 +676,9 @@ def output_to_supabase(players_dict, tournament_name=TOURNAMENT_NAME):
         print(f"\n⚠ Warning: No player data to upload to Supabase")
         return 0
     
+    if snapshot_id is None:
+        snapshot_id = new_snapshot_id()
+    
     # Prepare data for Supabase
     records = []
     
@@ -481,6 +720,7 @@ def output_to_supabase(players_dict, tournament_name=TOURNAMENT_NAME):
                 "cutter_score": float(scores.get("cutter_score", 0)),
                 "defender_score": float(scores.get("defender_score", 0)),
                 "questionable": questionable,
+                "snapshot_id": snapshot_id,
             }
             
             records.append(record)
@@ -490,26 +730,58 @@ def output_to_supabase(players_dict, tournament_name=TOURNAMENT_NAME):
         return 0
     
     try:
-        # First, delete all existing records for this tournament
-        print(f"\nDeleting existing records for tournament '{tournament_name}'...")
-        delete_response = supabase.table("live_scores").delete().eq("tournament_name", tournament_name).execute()
-        deleted_count = len(delete_response.data) if delete_response.data else 0
-        print(f"  Deleted {deleted_count} existing record(s)")
-        
-        # Then, insert all new records
-        print(f"\nInserting {len(records)} new record(s) into Supabase...")
-        insert_response = supabase.table("live_scores").insert(records).execute()
-        
-        inserted_count = len(insert_response.data) if insert_response.data else 0
+        # Write the new snapshot next to the current one (readers are unaffected),
+        # in concurrent chunks that are retried on transient failures
+        print(f"\nInserting {len(records)} new record(s) into Supabase as snapshot {snapshot_id}...")
+        inserted_count = bulk_upsert(
+            os.getenv("SUPABASE_URL"),
+            os.getenv("SUPABASE_KEY"),
+            LIVE_SCORES_TABLE,
+            records,
+            LIVE_SCORES_CONFLICT_KEY,
+        )
         print(f"✓ Successfully inserted {inserted_count} record(s) into Supabase")
-        
-        return inserted_count
-        
     except Exception as e:
         print(f"\n✗ Error updating Supabase: {e}")
         import traceback
         traceback.print_exc()
+        # Readers still see the previous snapshot; drop whatever was partially written
+        try:
+            supabase.table(LIVE_SCORES_TABLE).delete().eq("tournament_name", tournament_name).eq("snapshot_id", snapshot_id).execute()
+        except Exception as cleanup_error:
+            print(f"  Warning: Could not remove partial snapshot {snapshot_id}: {cleanup_error}")
+        return 0
+    
+    try:
+        # Flip the tournament's pointer so readers switch to the new snapshot at once
+        previous_snapshot_id, current_snapshot_id = publish_snapshot(
+            supabase, tournament_name, snapshot_id
+        )
+    except Exception as e:
+        print(f"\n✗ Error publishing Supabase snapshot: {e}")
+        print(f"  Run the latest supabase_schema.sql to create {PUBLISH_SNAPSHOT_FUNCTION}()")
+        import traceback
+        traceback.print_exc()
+        return 0
+    
+    if current_snapshot_id != snapshot_id:
+        # A newer run published first; this snapshot will never be read
+        print(f"\n⚠ Warning: Newer snapshot {current_snapshot_id} is already published, dropping snapshot {snapshot_id}")
+        try:
+            supabase.table(LIVE_SCORES_TABLE).delete().eq("tournament_name", tournament_name).eq("snapshot_id", snapshot_id).execute()
+        except Exception as cleanup_error:
+            print(f"  Warning: Could not remove stale snapshot {snapshot_id}: {cleanup_error}")
         return 0
+    print(f"✓ Published snapshot {snapshot_id} for tournament '{tournament_name}'")
+    
+    # Snapshots before the previous one are no longer visible, so they can be
+    # removed in the background; the previous one is kept as a fallback
+    if previous_snapshot_id is not None:
+        start_snapshot_gc(supabase, tournament_name, previous_snapshot_id)
+    
+    refresh_summaries(supabase)
+    
+    return inserted_count
 
 
 def main():
@@ -518,6 +790,10 @@ def main():
     print("UltiAnalytics Data Pulling Script")
     print("=" * 60)
     
+    profiler = create_profiler(profiling_requested(), project_root / "profiles")
+    if profiler["enabled"]:
+        print(f"Profiling enabled, writing reports to {profiler['output_dir']}")
+    
     # Check if URLs are configured
     if not ULTIANALYTICS_EXPORT_URLS:
         print("\nError: No UltiAnalytics export URLs configured!")
@@ -527,12 +803,11 @@ def main():
     # Download CSV data directly into memory
     print(f"\nDownloading data from {len(ULTIANALYTICS_EXPORT_URLS)} team(s)...")
     
-    csv_data_dict = {}
-    for team_name, export_url in ULTIANALYTICS_EXPORT_URLS.items():
-        csv_content = download_csv_to_memory(export_url, team_name)
-        if csv_content:
-            csv_data_dict[team_name] = csv_content
-        else:
+    # Rate-limited and prioritized: active teams first, idle teams from cache
+    with profile_stage(profiler, "download"):
+        csv_data_dict = fetch_team_exports(ULTIANALYTICS_EXPORT_URLS)
+    for team_name in ULTIANALYTICS_EXPORT_URLS:
+        if team_name not in csv_data_dict:
             print(f"  ✗ Failed to download data for {team_name}")
     
     if not csv_data_dict:
@@ -544,7 +819,87 @@ def main():
     print("Processing downloaded data...")
     print(f"{'=' * 60}")
     
-    players_dict = process_csv_data_in_memory(csv_data_dict)
+    warehouse = open_warehouse(WAREHOUSE_PATH) if WAREHOUSE_PATH else None
+    identity_index = create_identity_index()
+    if PLAYER_ALIASES_PATH.exists():
+        load_player_aliases(identity_index, PLAYER_ALIASES_PATH)
+        print(f"Loaded player aliases from {PLAYER_ALIASES_PATH}")
+    decayed = None
+    if PRICE_BASIS == "decayed":
+        decayed = load_decayed_aggregator(DECAYED_STATS_PATH, DECAY_HALF_LIFE, DECAY_BY)
+    checkpoint_settings = {
+        "search_term": TOURNAMENT_SEARCH_TERM,
+        "warehouse": WAREHOUSE_PATH,
+        "aliases": file_input_hash(PLAYER_ALIASES_PATH) if PLAYER_ALIASES_PATH.exists() else None,
+        "price_basis": PRICE_BASIS,
+        "decay": [DECAY_BY, DECAY_HALF_LIFE] if PRICE_BASIS == "decayed" else None,
+    }
+    checkpoint = None
+    if "--fresh" not in sys.argv[1:]:
+        checkpoint = load_checkpoint(PULL_CHECKPOINT_PATH, checkpoint_settings)
+    
+    with profile_stage(profiler, "process"):
+        input_hashes = {
+            team_name: input_hash(csv_content) for team_name, csv_content in csv_data_dict.items()
+        }
+        # Teams go one at a time in export order, restoring the player names
+        # a reused team had interned, so player ids match a full reprocess
+        players_dict = {}
+        interned = {}
+        game_summaries = {}
+        reused = []
+        for team_name, csv_content in csv_data_dict.items():
+            first_player_id = len(identity_index["names"])
+            entry = checkpoint_entry(checkpoint, team_name, input_hashes[team_name])
+            if entry is not None and not checkpoint_entry_in_stores(entry, team_name, warehouse, decayed):
+                print(f"\n{team_name} is unchanged but missing from the warehouse or decayed stats, reprocessing")
+                entry = None
+            if entry is not None:
+                reused.append(team_name)
+                restore_interned_names(identity_index, entry["interned"])
+                game_summaries[team_name] = entry["games"]
+                if entry["players"]:
+                    players_dict[team_name] = entry["players"]
+            else:
+                players_dict.update(
+                    process_csv_data_in_memory(
+                        {team_name: csv_content}, warehouse, identity_index, decayed, game_summaries
+                    )
+                )
+            interned[team_name] = interned_names(identity_index, first_player_id)
+        if reused:
+            print(f"\nReused unchanged data for {len(reused)} team(s): {', '.join(reused)}")
+        
+        # Saved before scoring, which adds to (and with decayed stats rewrites)
+        # the players' fields in place. Teams dropped for having no matching
+        # tournament are saved empty so they are skipped next time too.
+        try:
+            save_checkpoint(
+                PULL_CHECKPOINT_PATH,
+                {
+                    team_name: {
+                        "input_hash": input_hashes[team_name],
+                        "players": players_dict.get(team_name, {}),
+                        "interned": interned[team_name],
+                        "games": game_summaries.get(team_name, []),
+                        "decayed_digest": decayed_digest(decayed, team_name),
+                    }
+                    for team_name in csv_data_dict
+                },
+                checkpoint_settings,
+            )
+        except Exception as e:
+            print(f"⚠ Warning: Error writing warm-start checkpoint: {e}")
+    if decayed is not None:
+        save_decayed_aggregator(decayed, DECAYED_STATS_PATH)
+    
+    # Cross-check mirrored games between the downloaded teams
+    with profile_stage(profiler, "reconcile"):
+        game_issues = check_mirrored_games(game_summaries)
+    if game_issues and GAME_MISMATCH_POLICY == "hold":
+        print(f"\n✗ Holding publish: {game_issues} game issue(s) found (GAME_MISMATCH_POLICY=hold)")
+        write_profile_summary(profiler)
+        return 1
     
     if not players_dict:
         print(f"\n⚠ Warning: No player data found after processing files")
@@ -554,7 +909,8 @@ def main():
     
     # Filter for tournaments containing "cow"
     print(f"\nFiltering for tournaments containing '{TOURNAMENT_SEARCH_TERM}'...")
-    players_dict = filter_players_for_cowbell(players_dict)
+    with profile_stage(profiler, "filter"):
+        players_dict = filter_players_for_cowbell(players_dict)
     
     if not players_dict:
         print(f"\n⚠ Warning: No players found with tournaments containing '{TOURNAMENT_SEARCH_TERM}'")
@@ -563,14 +919,47 @@ def main():
     if players_dict:
         try:
             print("\nCalculating scores and prices...")
-            players_dict = calculate_all_scores(players_dict)
-            players_dict = calculate_players_prices(players_dict)
+            with profile_stage(profiler, "scores"):
+                if decayed is not None:
+                    print(f"  Using decayed stats (half-life {DECAY_HALF_LIFE:g} by {DECAY_BY})")
+                    players_dict = apply_decayed_stats(decayed, players_dict)
+                players_dict = set_player_ids(identity_index, players_dict)
+                players_dict = calculate_all_scores(
+                    players_dict, DECAYED_STATS_KEY if decayed is not None else None
+                )
+            with profile_stage(profiler, "prices"):
+                players_dict = calculate_players_prices(players_dict)
         except Exception as e:
             print(f"\n⚠ Warning: Error during score/price calculations: {e}")
             print("  Continuing with available data...")
     else:
         print("\nSkipping score/price calculations (no players found)")
     
+    run_snapshot_id = new_snapshot_id()
+    
+    # Emit per-player change events against the previous run
+    if players_dict:
+        try:
+            with profile_stage(profiler, "change_feed"):
+                events_count = publish_changes(players_dict, TOURNAMENT_NAME, run_snapshot_id)
+            print(f"\n✓ Emitted {events_count} change event(s) to {feed_path()}")
+        except Exception as e:
+            print(f"\n⚠ Warning: Error writing change feed: {e}")
+    
+    # Publish the scored snapshot for the read API (it reloads it from disk)
+    if players_dict:
+        try:
+            with profile_stage(profiler, "read_api_snapshot"):
+                snapshot_path = write_snapshot_file(
+                    players_dict,
+                    TOURNAMENT_NAME,
+                    run_snapshot_id,
+                    search_index=build_search_index(players_dict),
+                )
+            print(f"\n✓ Published read API snapshot to {snapshot_path}")
+        except Exception as e:
+            print(f"\n⚠ Warning: Error publishing read API snapshot: {e}")
+    
     # Update Supabase (optional - only if credentials are provided)
     records_count = 0
     supabase_configured = bool(os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_KEY"))
@@ -581,7 +970,8 @@ def main():
         print(f"{'=' * 60}")
         
         try:
-            records_count = output_to_supabase(players_dict, TOURNAMENT_NAME)
+            with profile_stage(profiler, "supabase"):
+                records_count = output_to_supabase(players_dict, TOURNAMENT_NAME, run_snapshot_id)
         except Exception as e:
             print(f"\n⚠ Warning: Error updating Supabase: {e}")
             import traceback
@@ -598,13 +988,17 @@ def main():
     print(f"{'=' * 60}")
     
     try:
-        sheets_rows = output_to_google_sheets(players_dict)
+        with profile_stage(profiler, "google_sheets"):
+            sheets_rows = output_to_google_sheets(players_dict)
     except Exception as e:
         print(f"\n⚠ Warning: Error updating Google Sheets: {e}")
         import traceback
         traceback.print_exc()
         sheets_rows = 0
     
+    wait_for_snapshot_gc()
+    write_profile_summary(profiler)
+    
     print(f"\n{'=' * 60}")
     if players_dict:
         print("✓ Script completed successfully!")
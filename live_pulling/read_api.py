@@ -0,0 +1,635 @@
+"""
+Read-only HTTP API for the website, served from memory.
+
+Keeps the latest scored players_dict for every tournament in memory and serves
+leaderboards, team rosters and player details without touching Supabase or
+Google Sheets. pull_data.py publishes a JSON snapshot per tournament into the
+snapshot directory; this service watches that directory and swaps in new
+snapshots as they appear.
+
+Usage:
+    python read_api.py
+
+Endpoints:
+    GET /tournaments
+    GET /tournaments/{tournament}/leaderboard?role=captain_score&limit=50&offset=0
+    GET /tournaments/{tournament}/teams/{team}
+    GET /tournaments/{tournament}/teams/{team}/players/{player}
+    GET /tournaments/{tournament}/search?q=smi&limit=10&kind=player
+    GET /tournaments/{tournament}/rosters/{roster_id}   (fantasy total of a user roster)
+    GET /changes?tournament=Cowbell   (Server-Sent Events of player changes)
+
+Responses carry an ETag (If-None-Match returns 304) and are gzip-compressed
+when the client accepts it. Leaderboard, roster and player responses are
+cached per snapshot under their normalized parameters, in an LRU of
+RESPONSE_CACHE_SIZE entries; search responses are not cached.
+/changes streams the change feed written by pull_data.py (see change_feed.py)
+from the moment of connecting, or from after the Last-Event-ID a reconnecting
+client sends.
+
+Environment:
+    READ_API_SNAPSHOT_DIR: Directory with published snapshots (defaults to live_pulling/snapshots)
+    READ_API_HOST: Host to bind (defaults to 127.0.0.1)
+    READ_API_PORT: Port to bind (defaults to 8080)
+    READ_API_REFRESH_SECONDS: How often to check for new snapshots (defaults to 2)
+    READ_API_ROSTERS_PATH: Optional JSON file of user rosters,
+                           {tournament: {roster_id: [[team, player, role], ...]}};
+                           totals are updated for the changed players of each new
+                           snapshot (needs numpy)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Add scripts directory to path to import calculation functions
+scripts_dir = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from utils.calculations import (
+    LEADERBOARD_ROLES,
+    build_leaderboards,
+    update_leaderboard_players,
+    leaderboard_slice,
+    rank_of_player,
+    leaderboard_size,
+    build_search_index,
+    save_search_index,
+    load_search_index,
+    search_players,
+    create_roster_book,
+    set_roster,
+    compute_roster_totals,
+    update_roster_totals,
+    roster_total,
+)
+from change_feed import CHANGE_FEED_DIR, feed_path, read_new_events
+
+SNAPSHOT_DIR = Path(
+    os.getenv("READ_API_SNAPSHOT_DIR", Path(__file__).resolve().parent / "snapshots")
+)
+HOST = os.getenv("READ_API_HOST", "127.0.0.1")
+PORT = int(os.getenv("READ_API_PORT", "8080"))
+REFRESH_SECONDS = float(os.getenv("READ_API_REFRESH_SECONDS", "2"))
+ROSTERS_PATH = os.getenv("READ_API_ROSTERS_PATH")
+
+DEFAULT_LEADERBOARD_LIMIT = 50
+MAX_LEADERBOARD_LIMIT = 500
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+# Encoded responses kept per tournament snapshot (least recently used evicted)
+RESPONSE_CACHE_SIZE = 256
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+
+# Comment line sent on idle change streams so proxies keep them open
+SSE_HEARTBEAT_SECONDS = 15
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def _search_index_path(snapshot_path):
+    return Path(snapshot_path).with_suffix(".search")
+
+
+def write_snapshot_file(
+    players_dict, tournament_name, snapshot_id, snapshot_dir=SNAPSHOT_DIR, search_index=None
+):
+    """
+    Publish a scored players_dict for the read API.
+
+    The file is written next to its final name and renamed into place, so the
+    service never loads a half-written snapshot. A search index is saved
+    beside it first, so it is in place when the snapshot is picked up.
+
+    Args:
+        players_dict: Scored and priced players data
+        tournament_name: Tournament the snapshot belongs to
+        snapshot_id: Snapshot id (e.g. the one written to Supabase)
+        snapshot_dir: Directory the read API watches
+        search_index: Optional index from build_search_index
+
+    Returns:
+        Path of the published snapshot file
+    """
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    path = snapshot_dir / f"{hashlib.sha1(tournament_name.encode('utf-8')).hexdigest()[:16]}.json"
+    if search_index is not None:
+        save_search_index(search_index, _search_index_path(path))
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {
+                "tournament_name": tournament_name,
+                "snapshot_id": snapshot_id,
+                "players": players_dict,
+            },
+            f,
+        )
+    os.replace(tmp_path, path)
+    return path
+
+
+def player_record(team_name, player_name, data):
+    """Flatten one player's data into the JSON shape served by the API."""
+    scores = data.get("scores", {})
+    return {
+        "team": team_name,
+        "player": player_name,
+        "tournaments": data.get("tournamemnts", data.get("tournaments", {})),
+        "assists": data.get("assists", 0),
+        "goals": data.get("goals", 0),
+        "ds": data.get("ds", 0),
+        "turnovers": data.get("turnovers", 0),
+        "games_played": data.get("games_played", 0),
+        "price": data.get("price", 0),
+        "captain_score": scores.get("captain_score", 0),
+        "handler_score": scores.get("handler_score", 0),
+        "cutter_score": scores.get("cutter_score", 0),
+        "defender_score": scores.get("defender_score", 0),
+        "questionable": data.get("questionable", False),
+    }
+
+
+def build_tournament_view(snapshot):
+    """
+    Precompute the player records and rosters served for one tournament snapshot.
+
+    Args:
+        snapshot: Parsed snapshot file contents
+
+    Returns:
+        Dictionary with player records and per-team rosters
+    """
+    players = {}
+    rosters = {}
+    for team_name, team_players in snapshot["players"].items():
+        rosters[team_name] = []
+        for player_name, data in team_players.items():
+            record = player_record(team_name, player_name, data)
+            players[(team_name, player_name)] = record
+            rosters[team_name].append(record)
+
+    return {
+        "tournament_name": snapshot["tournament_name"],
+        "snapshot_id": snapshot["snapshot_id"],
+        "players": players,
+        "rosters": rosters,
+        "responses": OrderedDict(),
+    }
+
+
+def create_state(snapshot_dir=SNAPSHOT_DIR, change_feed_dir=CHANGE_FEED_DIR, rosters_path=ROSTERS_PATH):
+    """Create the in-memory state of the read API."""
+    return {
+        "snapshot_dir": Path(snapshot_dir),
+        "change_feed_path": feed_path(change_feed_dir),
+        "rosters_path": Path(rosters_path) if rosters_path else None,
+        "rosters_mtime": None,
+        "file_mtimes": {},
+        "tournaments": {},
+        "leaderboards": {},
+        "rosters": {},
+    }
+
+
+def refresh_rosters(state):
+    """
+    Load the user rosters file if it is new or changed since the last refresh.
+
+    Each tournament gets a roster book (see create_roster_book), totalled
+    against its loaded snapshot.
+
+    Returns:
+        True if the rosters were (re)loaded
+    """
+    path = state["rosters_path"]
+    if path is None:
+        return False
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    if state["rosters_mtime"] == mtime:
+        return False
+
+    try:
+        with open(path) as f:
+            rosters = json.load(f)
+        books = {}
+        for tournament_name, tournament_rosters in rosters.items():
+            book = create_roster_book()
+            for roster_id, picks in tournament_rosters.items():
+                set_roster(book, roster_id, [tuple(pick) for pick in picks])
+            books[tournament_name] = book
+    except (OSError, ValueError, TypeError, ImportError) as e:
+        print(f"⚠ Warning: Could not load rosters from {path}: {e}")
+        state["rosters_mtime"] = mtime
+        return False
+
+    state["rosters"] = books
+    state["rosters_mtime"] = mtime
+    for tournament_name, view in state["tournaments"].items():
+        book = books.get(tournament_name)
+        if book is not None:
+            compute_roster_totals(book, view["players_dict"])
+        # Cached roster responses hold the previous totals
+        view["responses"].clear()
+    print(f"✓ Loaded rosters for {len(books)} tournament(s) from {path}")
+    return True
+
+
+def apply_snapshot(state, snapshot, search_index=None):
+    """
+    Swap in a new snapshot for its tournament.
+
+    Leaderboards and user roster totals of an already loaded tournament are
+    updated only for the players whose records changed. The search index
+    published with the snapshot is used when given, otherwise one is built.
+
+    Returns:
+        The new tournament view
+    """
+    view = build_tournament_view(snapshot)
+    view["search"] = search_index or build_search_index(snapshot["players"])
+    view["players_dict"] = snapshot["players"]
+    tournament_name = view["tournament_name"]
+    previous = state["tournaments"].get(tournament_name)
+    book = state["rosters"].get(tournament_name)
+
+    if previous is None:
+        build_leaderboards(state["leaderboards"], tournament_name, snapshot["players"])
+        if book is not None:
+            compute_roster_totals(book, snapshot["players"])
+    else:
+        changed = [
+            key
+            for key in previous["players"].keys() | view["players"].keys()
+            if previous["players"].get(key) != view["players"].get(key)
+        ]
+        update_leaderboard_players(
+            state["leaderboards"], tournament_name, snapshot["players"], changed
+        )
+        if book is not None:
+            update_roster_totals(book, snapshot["players"], changed)
+
+    state["tournaments"][tournament_name] = view
+    return view
+
+
+def refresh_snapshots(state):
+    """
+    Load snapshot files that are new or changed since the last refresh.
+
+    Returns:
+        Number of tournaments that were (re)loaded
+    """
+    refresh_rosters(state)
+    snapshot_dir = state["snapshot_dir"]
+    if not snapshot_dir.is_dir():
+        return 0
+
+    loaded = 0
+    for path in snapshot_dir.glob("*.json"):
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        if state["file_mtimes"].get(path) == mtime:
+            continue
+
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+            index_path = _search_index_path(path)
+            search_index = load_search_index(index_path) if index_path.exists() else None
+            view = apply_snapshot(state, snapshot, search_index)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠ Warning: Could not load snapshot {path.name}: {e}")
+            continue
+
+        state["file_mtimes"][path] = mtime
+        loaded += 1
+        print(f"✓ Loaded snapshot {view['snapshot_id']} for '{view['tournament_name']}' ({len(view['players'])} players)")
+
+    return loaded
+
+
+async def watch_snapshots(state, interval=REFRESH_SECONDS):
+    """Poll the snapshot directory and load new snapshots as they are published."""
+    while True:
+        refresh_snapshots(state)
+        await asyncio.sleep(interval)
+
+
+def _parse_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def route(state, path, query):
+    """
+    Resolve a request path to a JSON payload.
+
+    Returns:
+        Tuple of (status code, payload, cache owner, cache key) where cache
+        owner is the tournament view the encoded response may be cached on
+        (or None) and cache key identifies the response by its normalized
+        parameters
+    """
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+
+    if parts == ["tournaments"]:
+        payload = [
+            {"tournament_name": name, "snapshot_id": view["snapshot_id"]}
+            for name, view in sorted(state["tournaments"].items())
+        ]
+        return 200, payload, None, None
+
+    if len(parts) < 3 or parts[0] != "tournaments":
+        return 404, {"error": "not found"}, None, None
+
+    view = state["tournaments"].get(parts[1])
+    if view is None:
+        return 404, {"error": f"unknown tournament '{parts[1]}'"}, None, None
+
+    tournament_name = view["tournament_name"]
+
+    if parts[2] == "leaderboard" and len(parts) == 3:
+        role = query.get("role", ["captain_score"])[0]
+        if role not in LEADERBOARD_ROLES:
+            return 400, {"error": f"role must be one of {', '.join(LEADERBOARD_ROLES)}"}, None, None
+        limit = min(
+            max(_parse_int(query.get("limit", [None])[0], DEFAULT_LEADERBOARD_LIMIT), 0),
+            MAX_LEADERBOARD_LIMIT,
+        )
+        offset = max(_parse_int(query.get("offset", [None])[0], 0), 0)
+        entries = leaderboard_slice(state["leaderboards"], tournament_name, role, offset, limit)
+        payload = {
+            "tournament_name": tournament_name,
+            "snapshot_id": view["snapshot_id"],
+            "role": role,
+            "offset": offset,
+            "total": leaderboard_size(state["leaderboards"], tournament_name, role),
+            "players": [
+                dict(view["players"][(entry["team"], entry["player"])], rank=entry["rank"])
+                for entry in entries
+            ],
+        }
+        return 200, payload, view, ("leaderboard", role, offset, limit)
+
+    if parts[2] == "search" and len(parts) == 3:
+        text = query.get("q", [""])[0]
+        limit = min(
+            max(_parse_int(query.get("limit", [None])[0], DEFAULT_SEARCH_LIMIT), 0),
+            MAX_SEARCH_LIMIT,
+        )
+        kind = query.get("kind", [None])[0]
+        if kind not in (None, "player", "team"):
+            return 400, {"error": "kind must be player or team"}, None, None
+        payload = {
+            "tournament_name": tournament_name,
+            "snapshot_id": view["snapshot_id"],
+            "query": text,
+            "results": search_players(view["search"], text, limit, kind),
+        }
+        # Free-text queries are cheap to answer and unbounded, so never cached
+        return 200, payload, None, None
+
+    if parts[2] == "rosters" and len(parts) == 4:
+        book = state["rosters"].get(tournament_name)
+        if book is None or parts[3] not in book["roster_index"]:
+            return 404, {"error": f"unknown roster '{parts[3]}'"}, None, None
+        payload = {
+            "tournament_name": tournament_name,
+            "snapshot_id": view["snapshot_id"],
+            "roster_id": parts[3],
+            "total": roster_total(book, parts[3]),
+        }
+        return 200, payload, view, ("roster", parts[3])
+
+    if parts[2] == "teams" and len(parts) == 4:
+        roster = view["rosters"].get(parts[3])
+        if roster is None:
+            return 404, {"error": f"unknown team '{parts[3]}'"}, None, None
+        payload = {
+            "tournament_name": tournament_name,
+            "snapshot_id": view["snapshot_id"],
+            "team": parts[3],
+            "players": roster,
+        }
+        return 200, payload, view, ("team", parts[3])
+
+    if parts[2] == "teams" and len(parts) == 6 and parts[4] == "players":
+        record = view["players"].get((parts[3], parts[5]))
+        if record is None:
+            return 404, {"error": f"unknown player '{parts[5]}' on '{parts[3]}'"}, None, None
+        ranks = {
+            role: rank_of_player(state["leaderboards"], tournament_name, role, parts[3], parts[5])
+            for role in LEADERBOARD_ROLES
+        }
+        payload = dict(record, ranks=ranks, snapshot_id=view["snapshot_id"])
+        return 200, payload, view, ("player", parts[3], parts[5])
+
+    return 404, {"error": "not found"}, None, None
+
+
+def encode_response(status, payload):
+    """Encode a payload once: JSON body, its gzip form and its ETag."""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return {
+        "status": status,
+        "body": body,
+        "gzip_body": gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None,
+        "etag": '"' + hashlib.sha1(body).hexdigest() + '"',
+    }
+
+
+def get_response(state, target):
+    """Look up (or build and cache) the encoded response for a request target."""
+    url = urlsplit(target)
+    status, payload, view, cache_key = route(state, url.path, parse_qs(url.query))
+
+    if view is None:
+        return encode_response(status, payload)
+
+    responses = view["responses"]
+    cached = responses.get(cache_key)
+    if cached is None:
+        cached = encode_response(status, payload)
+        responses[cache_key] = cached
+        if len(responses) > RESPONSE_CACHE_SIZE:
+            responses.popitem(last=False)
+    else:
+        responses.move_to_end(cache_key)
+    return cached
+
+
+async def stream_changes(state, writer, query, last_event_id):
+    """
+    Stream change feed events to one client as Server-Sent Events.
+
+    Without last_event_id the stream starts at the end of the feed; with it,
+    every event after that sequence number still in the feed file is replayed
+    first. ?tournament= limits the stream to one tournament.
+    """
+    tournament = query.get("tournament", [None])[0]
+    path = state["change_feed_path"]
+
+    head = [
+        "HTTP/1.1 200 OK",
+        "Content-Type: text/event-stream",
+        "Cache-Control: no-cache",
+        "Connection: keep-alive",
+    ]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+    writer.write(f"retry: {int(REFRESH_SECONDS * 1000)}\n\n".encode("utf-8"))
+    await writer.drain()
+
+    if last_event_id is None:
+        _, offset = read_new_events(path, 0)
+    else:
+        offset = 0
+
+    idle = 0.0
+    while True:
+        lines, offset = read_new_events(path, offset)
+        chunks = []
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if last_event_id is not None and event["seq"] <= last_event_id:
+                continue
+            if tournament is not None and event["tournament"] != tournament:
+                continue
+            chunks.append(f"id: {event['seq']}\nevent: player\ndata: ".encode("utf-8") + line + b"\n\n")
+
+        if chunks:
+            writer.write(b"".join(chunks))
+            idle = 0.0
+        elif idle >= SSE_HEARTBEAT_SECONDS:
+            writer.write(b": keepalive\n\n")
+            idle = 0.0
+        await writer.drain()
+
+        await asyncio.sleep(REFRESH_SECONDS)
+        idle += REFRESH_SECONDS
+
+
+async def handle_connection(state, reader, writer):
+    """Serve HTTP/1.1 requests on one connection (keep-alive supported)."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            url = urlsplit(target)
+            if method == "GET" and url.path.rstrip("/") == "/changes":
+                last_event_id = headers.get("last-event-id") or parse_qs(url.query).get(
+                    "last_event_id", [None]
+                )[0]
+                await stream_changes(
+                    state,
+                    writer,
+                    parse_qs(url.query),
+                    _parse_int(last_event_id, None),
+                )
+                break
+
+            if method not in ("GET", "HEAD"):
+                response = encode_response(405, {"error": "method not allowed"})
+            else:
+                response = get_response(state, target)
+
+            status = response["status"]
+            body = response["body"]
+            extra_headers = [f"ETag: {response['etag']}", "Cache-Control: no-cache"]
+
+            if status == 200 and headers.get("if-none-match") == response["etag"]:
+                status = 304
+                body = b""
+            elif response["gzip_body"] is not None and "gzip" in headers.get("accept-encoding", ""):
+                body = response["gzip_body"]
+                extra_headers.append("Content-Encoding: gzip")
+            extra_headers.append("Vary: Accept-Encoding")
+
+            keep_alive = (
+                version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            )
+            head = [
+                f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            ] + extra_headers
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=HOST, port=PORT, snapshot_dir=SNAPSHOT_DIR):
+    """Load the published snapshots and serve them until cancelled."""
+    state = create_state(snapshot_dir)
+    refresh_snapshots(state)
+
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(state, reader, writer), host, port
+    )
+    print(f"Serving {len(state['tournaments'])} tournament(s) on http://{host}:{port}")
+
+    watcher = asyncio.create_task(watch_snapshots(state))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,331 @@
+"""
+Multi-worksheet Google Sheets publisher.
+
+Lays the scored players out over several tabs:
+    - the main worksheet (GOOGLE_SHEET_WORKSHEET_NAME): every player, as before
+    - "Leaderboard": every player ranked by captain score
+    - "Tournament - <name>": players who played in that tournament
+    - "Team - <name>": one roster per team
+
+Every tab is sized to its data, and all tab creation, resizing, values and
+formatting go out in a single spreadsheets.batchUpdate, so a refresh costs
+the same number of API calls (one metadata read, one batch update) however
+many tabs or rows there are. Tabs from earlier runs whose team or tournament
+is gone are deleted in the same batch. Prices are left out of every tab, as
+in the original sheet.
+"""
+
+import hashlib
+import re
+
+LEADERBOARD_TITLE = "Leaderboard"
+TOURNAMENT_PREFIX = "Tournament - "
+TEAM_PREFIX = "Team - "
+
+# Google Sheets limits tab titles to 100 characters
+SHEET_TITLE_MAX = 100
+
+ALL_PLAYERS_HEADERS = [
+    "Team",
+    "Player",
+    "Goals",
+    "Assists",
+    "Ds",
+    "Turnovers",
+    "Captain Score",
+    "Handler Score",
+    "Cutter Score",
+    "Defender Score",
+]
+
+LEADERBOARD_HEADERS = [
+    "Rank",
+    "Team",
+    "Player",
+    "Captain Score",
+    "Handler Score",
+    "Cutter Score",
+    "Defender Score",
+]
+
+TOURNAMENT_HEADERS = [
+    "Team",
+    "Player",
+    "Games Played",
+    "Opponents",
+    "Captain Score",
+    "Handler Score",
+    "Cutter Score",
+    "Defender Score",
+]
+
+TEAM_HEADERS = [
+    "Player",
+    "Games Played",
+    "Goals",
+    "Assists",
+    "Ds",
+    "Turnovers",
+    "Plus/Minus",
+    "Points Played",
+    "Captain Score",
+    "Handler Score",
+    "Cutter Score",
+    "Defender Score",
+    "Questionable",
+]
+
+
+def sheet_title(prefix, name):
+    """Tab title for a team or tournament, within the Sheets title rules."""
+    name = re.sub(r"[\[\]*?/\\:]", "-", name).strip() or "(none)"
+    return (prefix + name)[:SHEET_TITLE_MAX]
+
+
+def _score_columns(data):
+    scores = data.get("scores", {})
+    return [
+        scores.get("captain_score", 0),
+        scores.get("handler_score", 0),
+        scores.get("cutter_score", 0),
+        scores.get("defender_score", 0),
+    ]
+
+
+def all_players_rows(players_dict):
+    rows = [ALL_PLAYERS_HEADERS]
+    for team_name, players in players_dict.items():
+        for player_name, data in players.items():
+            rows.append(
+                [
+                    team_name,
+                    player_name,
+                    data.get("goals", 0),
+                    data.get("assists", 0),
+                    data.get("ds", 0),
+                    data.get("turnovers", 0),
+                ]
+                + _score_columns(data)
+            )
+    return rows
+
+
+def leaderboard_rows(players_dict):
+    ranked = sorted(
+        (
+            (data.get("scores", {}).get("captain_score", 0), team_name, player_name, data)
+            for team_name, players in players_dict.items()
+            for player_name, data in players.items()
+        ),
+        key=lambda entry: (-entry[0], entry[1], entry[2]),
+    )
+    rows = [LEADERBOARD_HEADERS]
+    for rank, (_, team_name, player_name, data) in enumerate(ranked, start=1):
+        rows.append([rank, team_name, player_name] + _score_columns(data))
+    return rows
+
+
+def tournament_rows(players_dict, tournament_name):
+    rows = [TOURNAMENT_HEADERS]
+    for team_name, players in players_dict.items():
+        for player_name, data in players.items():
+            games = data.get("tournamemnts", {}).get(tournament_name)
+            if not games:
+                continue
+            rows.append(
+                [team_name, player_name, len(games), ", ".join(games)]
+                + _score_columns(data)
+            )
+    return rows
+
+
+def team_rows(players_dict, team_name):
+    rows = [TEAM_HEADERS]
+    for player_name, data in players_dict[team_name].items():
+        rows.append(
+            [
+                player_name,
+                data.get("games_played", 0),
+                data.get("goals", 0),
+                data.get("assists", 0),
+                data.get("ds", 0),
+                data.get("turnovers", 0),
+                data.get("plus_minus", 0),
+                data.get("points_played", 0),
+            ]
+            + _score_columns(data)
+            + [data.get("questionable", False)]
+        )
+    return rows
+
+
+def build_sheet_layout(players_dict, main_title):
+    """
+    Rows of every tab, keyed by tab title in display order.
+
+    Returns:
+        Dictionary of {title: list of rows (header first)}
+    """
+    layout = {
+        main_title: all_players_rows(players_dict),
+        LEADERBOARD_TITLE: leaderboard_rows(players_dict),
+    }
+
+    tournaments = []
+    for players in players_dict.values():
+        for data in players.values():
+            for tournament_name in data.get("tournamemnts", {}):
+                if tournament_name not in tournaments:
+                    tournaments.append(tournament_name)
+    for tournament_name in sorted(tournaments):
+        layout.setdefault(
+            sheet_title(TOURNAMENT_PREFIX, tournament_name),
+            tournament_rows(players_dict, tournament_name),
+        )
+
+    for team_name in sorted(players_dict):
+        layout.setdefault(sheet_title(TEAM_PREFIX, team_name), team_rows(players_dict, team_name))
+
+    return layout
+
+
+def _is_managed_title(title):
+    return (
+        title == LEADERBOARD_TITLE
+        or title.startswith(TOURNAMENT_PREFIX)
+        or title.startswith(TEAM_PREFIX)
+    )
+
+
+def _cell(value, bold=False):
+    if isinstance(value, bool):
+        cell = {"userEnteredValue": {"boolValue": value}}
+    elif isinstance(value, (int, float)):
+        cell = {"userEnteredValue": {"numberValue": value}}
+    elif value is None or value == "":
+        cell = {}
+    else:
+        cell = {"userEnteredValue": {"stringValue": str(value)}}
+    if bold:
+        cell["userEnteredFormat"] = {"textFormat": {"bold": True}}
+    return cell
+
+
+def _new_sheet_id(title, taken):
+    """Deterministic id for a new tab (the same title gets the same id), avoiding taken ids."""
+    sheet_id = int(hashlib.sha1(title.encode("utf-8")).hexdigest()[:8], 16) & 0x7FFFFFFF
+    while sheet_id in taken or sheet_id == 0:
+        sheet_id = (sheet_id + 1) & 0x7FFFFFFF
+    taken.add(sheet_id)
+    return sheet_id
+
+
+def build_batch_requests(layout, existing_sheets):
+    """
+    Every request of a refresh, for one spreadsheets.batchUpdate.
+
+    Args:
+        layout: {title: rows} from build_sheet_layout
+        existing_sheets: {title: sheetId} of the spreadsheet's current tabs
+
+    Returns:
+        List of batchUpdate requests
+    """
+    taken = set(existing_sheets.values())
+    requests = []
+
+    for title, sheet_id in existing_sheets.items():
+        if _is_managed_title(title) and title not in layout:
+            requests.append({"deleteSheet": {"sheetId": sheet_id}})
+
+    for title, rows in layout.items():
+        column_count = max(len(row) for row in rows)
+        grid = {
+            "rowCount": len(rows),
+            "columnCount": column_count,
+            # Sheets refuses to freeze every row of a tab
+            "frozenRowCount": 1 if len(rows) > 1 else 0,
+        }
+
+        sheet_id = existing_sheets.get(title)
+        if sheet_id is None:
+            sheet_id = _new_sheet_id(title, taken)
+            requests.append(
+                {
+                    "addSheet": {
+                        "properties": {
+                            "sheetId": sheet_id,
+                            "title": title,
+                            "gridProperties": grid,
+                        }
+                    }
+                }
+            )
+        else:
+            requests.append(
+                {
+                    "updateSheetProperties": {
+                        "properties": {"sheetId": sheet_id, "gridProperties": grid},
+                        "fields": "gridProperties(rowCount,columnCount,frozenRowCount)",
+                    }
+                }
+            )
+
+        # The grid is exactly the data's size, so writing every cell (padded
+        # rows included) replaces everything left from the previous run
+        requests.append(
+            {
+                "updateCells": {
+                    "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+                    "rows": [
+                        {
+                            "values": [
+                                _cell(row[c] if c < len(row) else None, bold=r == 0)
+                                for c in range(column_count)
+                            ]
+                        }
+                        for r, row in enumerate(rows)
+                    ],
+                    "fields": "userEnteredValue,userEnteredFormat.textFormat",
+                }
+            }
+        )
+        requests.append(
+            {
+                "autoResizeDimensions": {
+                    "dimensions": {
+                        "sheetId": sheet_id,
+                        "dimension": "COLUMNS",
+                        "startIndex": 0,
+                        "endIndex": column_count,
+                    }
+                }
+            }
+        )
+
+    return requests
+
+
+def publish_sheets(spreadsheet, players_dict, main_title):
+    """
+    Write every tab of the layout with one metadata read and one batch update.
+
+    Args:
+        spreadsheet: gspread Spreadsheet
+        players_dict: Scored and priced players data
+        main_title: Title of the all-players worksheet
+
+    Returns:
+        Tuple of (number of tabs written, rows written to the main worksheet including header)
+    """
+    metadata = spreadsheet.fetch_sheet_metadata(
+        params={"fields": "sheets.properties(sheetId,title)"}
+    )
+    existing_sheets = {
+        sheet["properties"]["title"]: sheet["properties"]["sheetId"]
+        for sheet in metadata.get("sheets", [])
+    }
+
+    layout = build_sheet_layout(players_dict, main_title)
+    spreadsheet.batch_update({"requests": build_batch_requests(layout, existing_sheets)})
+    return len(layout), len(layout[main_title])
@@ -0,0 +1,139 @@
+"""
+Chunked, concurrent bulk writes to Supabase.
+
+Records are split into chunks sized to a target payload (so wide or narrow rows
+both stay well under request-size limits), and the chunks are sent
+concurrently over the async Supabase client with bounded parallelism. Chunks
+are written as upserts on the table's unique key, so a chunk that failed
+halfway (or succeeded but timed out) can simply be sent again.
+
+Environment:
+    SUPABASE_CHUNK_BYTES: Target JSON payload per request (defaults to 256 KB)
+    SUPABASE_MAX_CHUNK_ROWS: Upper bound on rows per request (defaults to 1000)
+    SUPABASE_MAX_CONCURRENCY: Requests in flight at once (defaults to 4)
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+
+from supabase import acreate_client
+
+SUPABASE_CHUNK_BYTES = int(os.getenv("SUPABASE_CHUNK_BYTES", str(256 * 1024)))
+SUPABASE_MAX_CHUNK_ROWS = int(os.getenv("SUPABASE_MAX_CHUNK_ROWS", "1000"))
+SUPABASE_MAX_CONCURRENCY = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "4"))
+
+# Attempts per chunk, with exponential backoff (plus jitter) between them
+MAX_ATTEMPTS = 4
+RETRY_BASE_SECONDS = 0.5
+
+# Records sampled to estimate the average row size
+SIZE_SAMPLE_ROWS = 200
+
+
+def chunk_size_for(records, target_bytes=SUPABASE_CHUNK_BYTES, max_rows=SUPABASE_MAX_CHUNK_ROWS):
+    """Rows per chunk so that each request body is about target_bytes."""
+    if not records:
+        return 1
+    step = max(1, len(records) // SIZE_SAMPLE_ROWS)
+    sample = records[::step][:SIZE_SAMPLE_ROWS]
+    avg_bytes = len(json.dumps(sample, separators=(",", ":"))) / len(sample)
+    return max(1, min(max_rows, int(target_bytes // max(avg_bytes, 1))))
+
+
+def chunk_records(records, chunk_size):
+    """Split records into consecutive chunks of at most chunk_size rows."""
+    return [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+
+
+async def _upsert_chunk(client, table, chunk, on_conflict, semaphore, chunk_index):
+    """Upsert one chunk, retrying with backoff; returns rows written."""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        async with semaphore:
+            try:
+                await client.table(table).upsert(
+                    chunk, on_conflict=on_conflict, returning="minimal"
+                ).execute()
+                return len(chunk)
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                error = e
+
+        delay = RETRY_BASE_SECONDS * 2 ** (attempt - 1) * (1 + random.random())
+        print(
+            f"  ⚠ Chunk {chunk_index} ({len(chunk)} rows) failed (attempt {attempt}/{MAX_ATTEMPTS}): "
+            f"{error}; retrying in {delay:.1f}s"
+        )
+        await asyncio.sleep(delay)
+
+
+async def bulk_upsert_async(
+    supabase_url,
+    supabase_key,
+    table,
+    records,
+    on_conflict,
+    chunk_size=None,
+    max_concurrency=SUPABASE_MAX_CONCURRENCY,
+):
+    """
+    Upsert records in concurrent chunks over the async Supabase client.
+
+    Raises the first chunk error once every chunk has finished or given up.
+
+    Returns:
+        Tuple of (rows written, number of chunks)
+    """
+    chunk_size = chunk_size or chunk_size_for(records)
+    chunks = chunk_records(records, chunk_size)
+    client = await acreate_client(supabase_url, supabase_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    results = await asyncio.gather(
+        *(
+            _upsert_chunk(client, table, chunk, on_conflict, semaphore, i)
+            for i, chunk in enumerate(chunks)
+        ),
+        return_exceptions=True,
+    )
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        written = sum(result for result in results if not isinstance(result, BaseException))
+        print(f"  ✗ {len(errors)} of {len(chunks)} chunk(s) failed ({written} rows written)")
+        raise errors[0]
+    return sum(results), len(chunks)
+
+
+def bulk_upsert(supabase_url, supabase_key, table, records, on_conflict, **kwargs):
+    """
+    Synchronous entry point for bulk_upsert_async that reports throughput.
+
+    Args:
+        supabase_url: Supabase project URL
+        supabase_key: Supabase service role key
+        table: Table to write to
+        records: List of row dictionaries
+        on_conflict: Comma-separated unique key columns, making retries idempotent
+        **kwargs: chunk_size / max_concurrency overrides
+
+    Returns:
+        Number of rows written
+    """
+    if not records:
+        return 0
+
+    started = time.perf_counter()
+    written, chunk_count = asyncio.run(
+        bulk_upsert_async(supabase_url, supabase_key, table, records, on_conflict, **kwargs)
+    )
+    elapsed = time.perf_counter() - started
+    rate = written / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"✓ Wrote {written} record(s) to {table} in {chunk_count} chunk(s) "
+        f"in {elapsed:.2f}s ({rate:,.0f} rows/sec)"
+    )
+    return written
@@ -1,5 +1,6 @@
 -- Supabase table schema for live_scores
 -- Run this SQL in your Supabase SQL Editor to create the table
+-- (safe to re-run: every statement is idempotent and upgrades an existing project in place)
 
 -- Create the live_scores table
 CREATE TABLE IF NOT EXISTS live_scores (
@@ -20,11 +21,80 @@ CREATE TABLE IF NOT EXISTS live_scores (
     cutter_score NUMERIC(10, 2) NOT NULL DEFAULT 0,
     defender_score NUMERIC(10, 2) NOT NULL DEFAULT 0,
     questionable BOOLEAN NOT NULL DEFAULT FALSE,
+    snapshot_id BIGINT NOT NULL DEFAULT 0, -- Snapshot the row was written under (see live_scores_current_snapshot)
     updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
-    -- Ensure unique combination of tournament_name, team, and player
-    UNIQUE(tournament_name, team, player)
+    -- Ensure unique combination of tournament_name, snapshot, team, and player
+    UNIQUE(tournament_name, snapshot_id, team, player)
 );
 
+-- Upgrade tables created before snapshot versioning was added
+ALTER TABLE live_scores ADD COLUMN IF NOT EXISTS snapshot_id BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE live_scores DROP CONSTRAINT IF EXISTS live_scores_tournament_name_team_player_key;
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'live_scores_tournament_name_snapshot_id_team_player_key'
+    ) THEN
+        ALTER TABLE live_scores
+            ADD CONSTRAINT live_scores_tournament_name_snapshot_id_team_player_key
+            UNIQUE (tournament_name, snapshot_id, team, player);
+    END IF;
+END $$;
+
+-- Pointer to the snapshot readers should see, one row per tournament.
+-- The pull script writes a complete snapshot first and then flips this pointer
+-- with a single upsert, so readers never see a half-written leaderboard.
+CREATE TABLE IF NOT EXISTS live_scores_current_snapshot (
+    tournament_name TEXT PRIMARY KEY,
+    snapshot_id BIGINT NOT NULL,
+    published_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Moves a tournament's pointer to a newly written snapshot, but only forward:
+-- a run finishing after a newer run has published leaves the pointer alone.
+-- Returns the pointer before the call and the pointer now in effect.
+CREATE OR REPLACE FUNCTION publish_live_scores_snapshot(p_tournament_name TEXT, p_snapshot_id BIGINT)
+RETURNS TABLE (previous_snapshot_id BIGINT, current_snapshot_id BIGINT) AS $$
+DECLARE
+    v_previous BIGINT;
+BEGIN
+    SELECT c.snapshot_id INTO v_previous
+    FROM live_scores_current_snapshot c
+    WHERE c.tournament_name = p_tournament_name
+    FOR UPDATE;
+
+    INSERT INTO live_scores_current_snapshot AS c (tournament_name, snapshot_id, published_at)
+    VALUES (p_tournament_name, p_snapshot_id, NOW())
+    ON CONFLICT (tournament_name) DO UPDATE
+        SET snapshot_id = EXCLUDED.snapshot_id, published_at = EXCLUDED.published_at
+        WHERE c.snapshot_id < EXCLUDED.snapshot_id;
+
+    RETURN QUERY
+    SELECT v_previous, c.snapshot_id
+    FROM live_scores_current_snapshot c
+    WHERE c.tournament_name = p_tournament_name;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION publish_live_scores_snapshot(TEXT, BIGINT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION publish_live_scores_snapshot(TEXT, BIGINT) TO service_role;
+
+-- Point existing tournaments at their pre-snapshot rows
+INSERT INTO live_scores_current_snapshot (tournament_name, snapshot_id)
+SELECT DISTINCT tournament_name, 0 FROM live_scores WHERE snapshot_id = 0
+ON CONFLICT (tournament_name) DO NOTHING;
+
+-- Create index for looking up (and garbage-collecting) a tournament's snapshots
+CREATE INDEX IF NOT EXISTS idx_live_scores_tournament_snapshot ON live_scores(tournament_name, snapshot_id);
+
+-- Readers should query this view: it only ever serves the current snapshot
+CREATE OR REPLACE VIEW live_scores_current AS
+SELECT s.*
+FROM live_scores s
+JOIN live_scores_current_snapshot c
+    ON c.tournament_name = s.tournament_name
+   AND c.snapshot_id = s.snapshot_id;
+
 -- Create index for faster queries by tournament_name
 CREATE INDEX IF NOT EXISTS idx_live_scores_tournament_name ON live_scores(tournament_name);
 
@@ -42,11 +112,20 @@ ALTER TABLE live_scores ENABLE ROW LEVEL SECURITY;
 
 -- Create a policy that allows all operations (adjust based on your security needs)
 -- For service role access, you may want to disable RLS or create appropriate policies
+DROP POLICY IF EXISTS "Allow all operations for service role" ON live_scores;
 CREATE POLICY "Allow all operations for service role" ON live_scores
     FOR ALL
     USING (true)
     WITH CHECK (true);
 
+ALTER TABLE live_scores_current_snapshot ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow all operations for service role" ON live_scores_current_snapshot;
+CREATE POLICY "Allow all operations for service role" ON live_scores_current_snapshot
+    FOR ALL
+    USING (true)
+    WITH CHECK (true);
+
 -- Optional: Create a function to automatically update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -57,6 +136,115 @@ END;
 $$ language 'plpgsql';
 
 -- Create trigger to automatically update updated_at
+DROP TRIGGER IF EXISTS update_live_scores_updated_at ON live_scores;
 CREATE TRIGGER update_live_scores_updated_at BEFORE UPDATE ON live_scores
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+
+-- Covering index for the site's leaderboard read of the current snapshot
+-- (ordered by captain score), answered from the index alone without
+-- visiting the table rows. Team roster reads use the unique key index.
+CREATE INDEX IF NOT EXISTS idx_live_scores_leaderboard
+    ON live_scores(tournament_name, snapshot_id, captain_score DESC)
+    INCLUDE (team, player, price, handler_score, cutter_score, defender_score, questionable);
+
+DROP INDEX IF EXISTS idx_live_scores_roster;
+
+-- Summary views over the current snapshot, precomputed so summary pages are
+-- single index lookups instead of aggregations at read time. The pull script
+-- refreshes them (see refresh_live_scores_summaries) after publishing each
+-- snapshot. Every view has a unique index so it can be refreshed
+-- CONCURRENTLY, which lets reads continue during the refresh; the INCLUDE
+-- columns let those reads be served from the index alone.
+
+-- Per team totals
+CREATE MATERIALIZED VIEW IF NOT EXISTS live_scores_team_totals AS
+SELECT
+    tournament_name,
+    team,
+    MAX(snapshot_id) AS snapshot_id,
+    COUNT(*) AS players,
+    SUM(goals) AS goals,
+    SUM(assists) AS assists,
+    SUM(ds) AS ds,
+    SUM(turnovers) AS turnovers,
+    SUM(captain_score) AS captain_score,
+    AVG(captain_score) AS avg_captain_score,
+    AVG(price) AS avg_price,
+    COUNT(*) FILTER (WHERE questionable) AS questionable_players
+FROM live_scores_current
+GROUP BY tournament_name, team;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_live_scores_team_totals_key
+    ON live_scores_team_totals(tournament_name, team)
+    INCLUDE (players, goals, assists, ds, turnovers, captain_score, avg_captain_score, avg_price, questionable_players);
+
+-- Per tournament totals
+CREATE MATERIALIZED VIEW IF NOT EXISTS live_scores_tournament_totals AS
+SELECT
+    tournament_name,
+    MAX(snapshot_id) AS snapshot_id,
+    COUNT(DISTINCT team) AS teams,
+    COUNT(*) AS players,
+    SUM(goals) AS goals,
+    SUM(assists) AS assists,
+    SUM(ds) AS ds,
+    SUM(turnovers) AS turnovers,
+    AVG(captain_score) AS avg_captain_score,
+    MAX(captain_score) AS max_captain_score,
+    AVG(price) AS avg_price,
+    MIN(price) AS min_price,
+    MAX(price) AS max_price
+FROM live_scores_current
+GROUP BY tournament_name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_live_scores_tournament_totals_key
+    ON live_scores_tournament_totals(tournament_name)
+    INCLUDE (teams, players, goals, assists, ds, turnovers, avg_captain_score, max_captain_score, avg_price, min_price, max_price);
+
+-- Distribution of each role score per tournament (one row per role)
+CREATE MATERIALIZED VIEW IF NOT EXISTS live_scores_role_distributions AS
+SELECT
+    s.tournament_name,
+    r.role,
+    COUNT(*) AS players,
+    MIN(r.score) AS min_score,
+    percentile_cont(0.25) WITHIN GROUP (ORDER BY r.score) AS p25_score,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY r.score) AS median_score,
+    percentile_cont(0.75) WITHIN GROUP (ORDER BY r.score) AS p75_score,
+    percentile_cont(0.9) WITHIN GROUP (ORDER BY r.score) AS p90_score,
+    MAX(r.score) AS max_score,
+    AVG(r.score) AS avg_score
+FROM live_scores_current s
+CROSS JOIN LATERAL (
+    VALUES
+        ('captain', s.captain_score),
+        ('handler', s.handler_score),
+        ('cutter', s.cutter_score),
+        ('defender', s.defender_score)
+) AS r(role, score)
+GROUP BY s.tournament_name, r.role;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_live_scores_role_distributions_key
+    ON live_scores_role_distributions(tournament_name, role)
+    INCLUDE (players, min_score, p25_score, median_score, p75_score, p90_score, max_score, avg_score);
+
+-- Materialized views have no row level security; expose them read-only
+GRANT SELECT ON live_scores_team_totals, live_scores_tournament_totals, live_scores_role_distributions
+    TO anon, authenticated;
+
+-- Called by the pull script (supabase.rpc) after each published snapshot.
+-- CONCURRENTLY rebuilds each view next to the old contents and applies only
+-- the differences, so readers are never blocked while it runs.
+CREATE OR REPLACE FUNCTION refresh_live_scores_summaries()
+RETURNS VOID AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY live_scores_team_totals;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY live_scores_tournament_totals;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY live_scores_role_distributions;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Only the service role (the pull script) may trigger refreshes
+REVOKE EXECUTE ON FUNCTION refresh_live_scores_summaries() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_live_scores_summaries() TO service_role;
@@ -1,48 +1,163 @@
+import csv
 import os
+import sys
 from utils.calculations import (
     set_players_and_teams,
     set_players_stats,
     calculate_all_scores,
     output_to_csv_file,
+    output_to_csv_gz_file,
+    output_to_parquet_file,
+    output_to_arrow_file,
     calculate_players_prices,
     collect_tournaments_from_file,
     select_tournaments,
     filter_csv_by_tournaments,
     manage_players,
+    open_warehouse,
+    list_warehouse_tournaments,
+    ingest_team_events,
+    set_players_stats_from_warehouse,
+    create_identity_index,
+    load_player_aliases,
+    set_player_ids,
+    profiling_requested,
+    create_profiler,
+    profile_stage,
+    write_profile_summary,
+    build_search_index,
+    save_search_index,
+    file_input_hash,
+    save_checkpoint,
+    load_checkpoint,
+    checkpoint_entry,
+    interned_names,
+    restore_interned_names,
 )
 
+# python main.py --profile: cProfile + tracemalloc report per stage in profiles/
+profiler = create_profiler(profiling_requested())
+
+# Optional local event warehouse: when set, every file is ingested into it and
+# stats are served from its indexed aggregates instead of the CSV rows
+warehouse_path = os.getenv('WAREHOUSE_PATH')
+warehouse = open_warehouse(warehouse_path) if warehouse_path else None
+
+# Player identities: merges spellings of the same player across exports,
+# using the optional alias table in player_aliases.json
+identity_index = create_identity_index()
+if os.path.exists('player_aliases.json'):
+    load_player_aliases(identity_index, 'player_aliases.json')
+
+# Warm start: files whose contents are unchanged since the last run reuse the
+# saved team name, tournament selection and managed roster (with stats, scores
+# and prices) instead of asking again. python main.py --fresh ignores it.
+checkpoint_path = os.getenv('CHECKPOINT_PATH', 'main_checkpoint.ffck')
+checkpoint_settings = {
+    'warehouse': bool(warehouse_path),
+    'aliases': file_input_hash('player_aliases.json') if os.path.exists('player_aliases.json') else None,
+}
+checkpoint = None if '--fresh' in sys.argv[1:] else load_checkpoint(checkpoint_path, checkpoint_settings)
+
 filenames = []
 folder_dir = 'raw_data_files'
 for filename in os.listdir(folder_dir):
     filenames.append(folder_dir + '/' + filename)
 
+input_hashes = [file_input_hash(filename) for filename in filenames]
+saved_entries = [
+    checkpoint_entry(checkpoint, filename, input_hashes[i]) for i, filename in enumerate(filenames)
+]
+if warehouse is not None:
+    # Reused files skip ingest, so a team missing from the warehouse (e.g. a
+    # new or deleted warehouse file) has to be processed again
+    saved_entries = [
+        entry if entry is None or list_warehouse_tournaments(warehouse, entry['team']) else None
+        for entry in saved_entries
+    ]
+
 team_name = []
 for i, filename in enumerate(filenames):
+    if saved_entries[i] is not None:
+        print(f'{i}/{len(filenames)} | Unchanged since last run: {filename} ({saved_entries[i]["team"]})')
+        team_name.append(saved_entries[i]['team'])
+        continue
     filename.replace('raw_data_files/', '')
     name = input(f'{i}/{len(filenames)} | Enter team name for file {filename}: ')
     team_name.append(name)
 
 players_dict = {}
+checkpoint_entries = {}
 
 for i, file in enumerate(filenames):
 
-    players_dict, whole_csv = set_players_and_teams(
-        file, players_dict, team_name[i]
-    )
+    if saved_entries[i] is not None:
+        restore_interned_names(identity_index, saved_entries[i]['interned'])
+        players_dict[team_name[i]] = saved_entries[i]['players']
+        checkpoint_entries[file] = saved_entries[i]
+        continue
+
+    first_player_id = len(identity_index['names'])
+    with profile_stage(profiler, f'load {team_name[i]}'):
+        players_dict, whole_csv = set_players_and_teams(
+            file, players_dict, team_name[i], identity_index
+        )
     
     # Collect tournaments for this team and let user select which to include
     team_tournaments = collect_tournaments_from_file(file)
     selected_tournaments = select_tournaments(team_tournaments, team_name[i])
     
-    # Filter CSV data to only include selected tournaments
-    filtered_csv = filter_csv_by_tournaments(whole_csv, selected_tournaments)
-    
-    players_dict = set_players_stats(players_dict, team_name[i], filtered_csv)
+    with profile_stage(profiler, f'stats {team_name[i]}'):
+        if warehouse is not None:
+            # The warehouse keys events by the names as written in the file,
+            # so it is fed the rows before alias resolution
+            with open(file, newline='') as csvfile:
+                ingest_team_events(warehouse, team_name[i], list(csv.DictReader(csvfile)))
+            players_dict = set_players_stats_from_warehouse(
+                players_dict, team_name[i], warehouse, selected_tournaments,
+                identity_index=identity_index,
+            )
+        else:
+            # Filter CSV data to only include selected tournaments
+            filtered_csv = filter_csv_by_tournaments(whole_csv, selected_tournaments)
+
+            players_dict = set_players_stats(players_dict, team_name[i], filtered_csv)
     
     # Allow user to add/delete players before calculations
-    players_dict = manage_players(players_dict, team_name[i])
+    players_dict = manage_players(players_dict, team_name[i], identity_index)
+
+    checkpoint_entries[file] = {
+        'input_hash': input_hashes[i],
+        'team': team_name[i],
+        'selected_tournaments': selected_tournaments,
+        'players': players_dict[team_name[i]],
+        'interned': interned_names(identity_index, first_player_id),
+    }
+
+# Scores and prices saved in the checkpoint are still valid if no file changed
+unchanged = checkpoint is not None and checkpoint.keys() == checkpoint_entries.keys() and all(
+    entry is not None for entry in saved_entries
+)
+
+if not unchanged:
+    with profile_stage(profiler, 'scores'):
+        players_dict = set_player_ids(identity_index, players_dict)
+        players_dict = calculate_all_scores(players_dict)
+
+    with profile_stage(profiler, 'prices'):
+        players_dict = calculate_players_prices(players_dict)
+
+    save_checkpoint(checkpoint_path, checkpoint_entries, checkpoint_settings)
+
+with profile_stage(profiler, 'outputs'):
+    output_to_csv_file(players_dict)
+    output_to_csv_gz_file(players_dict)
+    save_search_index(build_search_index(players_dict))
 
-players_dict = calculate_all_scores(players_dict)
-players_dict = calculate_players_prices(players_dict)
+    try:
+        output_to_parquet_file(players_dict)
+        output_to_arrow_file(players_dict)
+    except ImportError as e:
+        print(f'Skipping Parquet/Arrow output: {e}')
 
-output_to_csv_file(players_dict)
+write_profile_summary(profiler)
@@ -0,0 +1,47 @@
+import os
+import sys
+from utils.calculations import (
+    REPLAY_CHECKPOINTS,
+    set_players_and_teams,
+    collect_tournaments_from_file,
+    filter_csv_by_tournaments,
+    create_identity_index,
+    load_player_aliases,
+    write_replay_history,
+)
+
+# python replay_history.py [point|game|round] [tournament search term]
+#
+# Replays every file in raw_data_files/ in game order and writes the price and
+# score history of every player to replay_history.jsonl (one line per
+# checkpoint, see write_replay_history). Team names are the file names without
+# .csv; the optional search term keeps only the tournaments containing it.
+args = sys.argv[1:]
+checkpoint = args[0] if args else 'game'
+if checkpoint not in REPLAY_CHECKPOINTS:
+    sys.exit(f'Checkpoint must be one of: {", ".join(REPLAY_CHECKPOINTS)}')
+search_term = args[1].lower() if len(args) > 1 else ''
+output_path = os.getenv('REPLAY_HISTORY_PATH', 'replay_history.jsonl')
+
+identity_index = create_identity_index()
+if os.path.exists('player_aliases.json'):
+    load_player_aliases(identity_index, 'player_aliases.json')
+
+folder_dir = 'raw_data_files'
+team_rows = {}
+for filename in sorted(os.listdir(folder_dir)):
+    file = folder_dir + '/' + filename
+    team_name = os.path.splitext(filename)[0]
+    _, whole_csv = set_players_and_teams(file, {}, team_name, identity_index)
+
+    tournaments = [
+        tournament for tournament in collect_tournaments_from_file(file)
+        if search_term in tournament.lower()
+    ]
+    if not tournaments:
+        print(f'No tournament matching "{search_term}" for {team_name}, skipping')
+        continue
+    team_rows[team_name] = filter_csv_by_tournaments(whole_csv, tournaments)
+
+written = write_replay_history(output_path, team_rows, checkpoint)
+print(f'Wrote {written} {checkpoint} checkpoint(s) for {len(team_rows)} team(s) to {output_path}')
@@ -1,7 +1,20 @@
 from .get_players import set_players_and_teams
-from .get_stats import set_players_stats
-from .calculate_scores import calculate_all_scores
-from .output_to_csv import output_to_csv_file
+from .get_stats import set_players_stats, set_derived_stats
+from .calculate_scores import SCORE_WEIGHTS, calculate_all_scores
+from .output_to_csv import output_to_csv_file, output_to_csv_gz_file
+from .output_columnar import output_to_parquet_file, output_to_arrow_file, read_arrow_file
 from .calculate_prices import calculate_players_prices
 from .select_tournaments import collect_all_tournaments, collect_tournaments_from_file, select_tournaments, filter_csv_by_tournaments
 from .manage_players import manage_players
+from .warehouse import open_warehouse, ingest_team_events, list_warehouse_tournaments, set_players_stats_from_warehouse
+from .leaderboards import LEADERBOARD_ROLES, build_leaderboards, update_leaderboard_players, top_k, leaderboard_slice, leaderboard_page, rank_of_player, leaderboard_size
+from .rosters import ROSTER_ROLES, create_roster_book, set_roster, compute_roster_totals, update_roster_totals, roster_total, roster_totals
+from .optimal_lineups import DEFAULT_LINEUP_SLOTS, DEFAULT_BUDGET, solve_optimal_lineups
+from .projections import per_game_rates, project_players
+from .replay import REPLAY_CHECKPOINTS, replay_events, write_replay_history, load_replay_history
+from .player_identity import create_identity_index, normalize_player_name, intern_player, add_player_alias, load_player_aliases, resolve_player, player_name, resolve_csv_names, set_player_ids, find_player_candidates
+from .profiling import PROFILE_FLAG, profiling_requested, create_profiler, profile_stage, write_profile_summary
+from .search_index import build_search_index, save_search_index, load_search_index, search_prefix, search_fuzzy, search_players
+from .decayed_stats import DECAY_KEYS, DECAYED_STATS, DECAYED_STATS_KEY, create_decayed_aggregator, update_decayed_stats, decayed_player_stats, apply_decayed_stats, save_decayed_aggregator, load_decayed_aggregator
+from .checkpoint import CHECKPOINT_VERSION, input_hash, file_input_hash, save_checkpoint, load_checkpoint, checkpoint_entry, interned_names, restore_interned_names
+from .game_reconciliation import summarize_games, game_key, reconcile_games, describe_game_issue
@@ -1,60 +1,60 @@
-def calculate_captain_score(players_dict):
+# Points per stat for each role score. Any counting stat set by
+# set_players_stats can be weighted here, e.g. plus_minus, points_played,
+# o_points, d_points, holds or breaks.
+SCORE_WEIGHTS = {
+    "captain_score": {"assists": 3, "goals": 3, "ds": 9, "turnovers": -3},
+    "handler_score": {"assists": 3, "goals": 1, "ds": 3, "turnovers": -1},
+    "cutter_score": {"assists": 1, "goals": 3, "ds": 3, "turnovers": -1},
+    "defender_score": {"assists": 1, "goals": 1, "ds": 9, "turnovers": -1},
+}
+
+
+def weighted_score(player, weights, stats_key=None):
+    """
+    Weighted sum of a player's stats. With stats_key, the stats are read from
+    player[stats_key] (e.g. decayed totals) instead of the player's own fields.
+    """
+    stats = player if stats_key is None else player.get(stats_key, player)
+    return sum(weight * stats.get(stat, 0) for stat, weight in weights.items())
+
+
+def calculate_captain_score(players_dict, stats_key=None):
     for team in players_dict:
         for player in players_dict[team].values():
-            assists = player["assists"]
-            goals = player["goals"]
-            ds = player["ds"]
-            turnovers = player["turnovers"]
-
-            captain_score = (3 * assists) + (3 * goals) + (9 * ds) - (3 * turnovers)
+            captain_score = weighted_score(player, SCORE_WEIGHTS["captain_score"], stats_key)
             player["scores"]["captain_score"] = captain_score
 
     return players_dict
 
 
-def calculate_handler_score(players_dict):
+def calculate_handler_score(players_dict, stats_key=None):
     for team in players_dict:
         for player in players_dict[team].values():
-            assists = player["assists"]
-            goals = player["goals"]
-            ds = player["ds"]
-            turnovers = player["turnovers"]
-
-            handler_score = (3 * assists) + (1 * goals) + (3 * ds) - (1 * turnovers)
+            handler_score = weighted_score(player, SCORE_WEIGHTS["handler_score"], stats_key)
             player["scores"]["handler_score"] = handler_score
 
     return players_dict
 
 
-def calculate_cutter_score(players_dict):
+def calculate_cutter_score(players_dict, stats_key=None):
     for team in players_dict:
         for player in players_dict[team].values():
-            assists = player["assists"]
-            goals = player["goals"]
-            ds = player["ds"]
-            turnovers = player["turnovers"]
-
-            cutter_score = (1 * assists) + (3 * goals) + (3 * ds) - (1 * turnovers)
+            cutter_score = weighted_score(player, SCORE_WEIGHTS["cutter_score"], stats_key)
             player["scores"]["cutter_score"] = cutter_score
 
     return players_dict
 
 
-def calculate_defender_score(players_dict):
+def calculate_defender_score(players_dict, stats_key=None):
     for team in players_dict:
         for player in players_dict[team].values():
-            assists = player["assists"]
-            goals = player["goals"]
-            ds = player["ds"]
-            turnovers = player["turnovers"]
-
-            defender_score = (1 * assists) + (1 * goals) + (9 * ds) - (1 * turnovers)
+            defender_score = weighted_score(player, SCORE_WEIGHTS["defender_score"], stats_key)
             player["scores"]["defender_score"] = defender_score
 
     return players_dict
 
 
-def calculate_all_scores(players_dict):
+def calculate_all_scores(players_dict, stats_key=None):
     for team in players_dict:
         for player in players_dict[team].values():
             player["scores"] = {
@@ -64,9 +64,9 @@ def calculate_all_scores(players_dict):
                 "defender_score": 0,
             }
 
-    players_dict = calculate_captain_score(players_dict)
-    players_dict = calculate_handler_score(players_dict)
-    players_dict = calculate_cutter_score(players_dict)
-    players_dict = calculate_defender_score(players_dict)
+    players_dict = calculate_captain_score(players_dict, stats_key)
+    players_dict = calculate_handler_score(players_dict, stats_key)
+    players_dict = calculate_cutter_score(players_dict, stats_key)
+    players_dict = calculate_defender_score(players_dict, stats_key)
 
     return players_dict
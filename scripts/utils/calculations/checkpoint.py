@@ -0,0 +1,124 @@
+import hashlib
+import marshal
+import os
+import struct
+import zlib
+
+from .player_identity import intern_player
+
+
+CHECKPOINT_MAGIC = b"FFCK"
+CHECKPOINT_VERSION = 2
+
+# magic, format version, marshal version, payload length, payload crc32
+CHECKPOINT_HEADER = struct.Struct("<4sHHII")
+
+
+def input_hash(content):
+    """Fingerprint of a team's raw input (CSV text or bytes)."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha1(content).hexdigest()
+
+
+def file_input_hash(path):
+    with open(path, "rb") as f:
+        return input_hash(f.read())
+
+
+def settings_hash(settings):
+    """Fingerprint of the settings a checkpoint was built with (any marshal-able value)."""
+    return hashlib.sha1(marshal.dumps(settings)).hexdigest()
+
+
+def save_checkpoint(path, entries, settings=None):
+    """
+    Write processed state as a compact binary checkpoint.
+
+    entries maps a key (team name, input file, ...) to a dict holding at least
+    "input_hash" plus whatever should be restored for it: the team's players
+    after manage_players with their stats, questionable flags, scores and
+    prices, selected tournaments, and so on. Values must be plain dicts,
+    lists, strings and numbers.
+
+    The payload is marshal (restored by one C call, no per-field parsing),
+    zlib-compressed, behind a fixed header with a version and checksum.
+    """
+    payload = zlib.compress(
+        marshal.dumps({"settings": settings_hash(settings), "entries": entries}), 1
+    )
+    header = CHECKPOINT_HEADER.pack(
+        CHECKPOINT_MAGIC, CHECKPOINT_VERSION, marshal.version, len(payload), zlib.crc32(payload)
+    )
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(path, settings=None):
+    """
+    Read a checkpoint written by save_checkpoint.
+
+    Returns the entries dict, or None when there is no usable checkpoint: a
+    missing file, another format or Python marshal version, a corrupt payload
+    or different settings. Checkpoints are local caches; never load one from
+    an untrusted source.
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < CHECKPOINT_HEADER.size:
+        return None
+
+    magic, version, marshal_version, length, crc = CHECKPOINT_HEADER.unpack_from(data)
+    payload = data[CHECKPOINT_HEADER.size:]
+    if (
+        magic != CHECKPOINT_MAGIC
+        or version != CHECKPOINT_VERSION
+        or marshal_version != marshal.version
+        or length != len(payload)
+        or crc != zlib.crc32(payload)
+    ):
+        return None
+
+    try:
+        state = marshal.loads(zlib.decompress(payload))
+    except (ValueError, EOFError, TypeError, zlib.error):
+        return None
+    if state.get("settings") != settings_hash(settings):
+        return None
+    return state["entries"]
+
+
+def checkpoint_entry(entries, key, current_input_hash):
+    """The saved entry for key if its input is unchanged, else None."""
+    if not entries:
+        return None
+    entry = entries.get(key)
+    if entry is None or entry.get("input_hash") != current_input_hash:
+        return None
+    return entry
+
+
+def interned_names(identity_index, start):
+    """[team, name] of every player interned into the index since id start."""
+    return [
+        [identity_index["teams"][player_id], identity_index["names"][player_id]]
+        for player_id in range(start, len(identity_index["names"]))
+    ]
+
+
+def restore_interned_names(identity_index, names):
+    """
+    Intern names saved by interned_names in their original order, so players
+    keep the same ids as when their input was processed.
+    """
+    for team_name, name in names:
+        intern_player(identity_index, team_name, name)
+    return identity_index
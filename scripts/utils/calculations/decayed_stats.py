@@ -0,0 +1,243 @@
+import hashlib
+import json
+import os
+from datetime import date
+
+from .get_stats import set_derived_stats
+
+
+DECAY_KEYS = ["date", "tournament"]
+
+# Bumped when the saved aggregator layout changes; older files are rebuilt
+DECAYED_STATE_VERSION = 2
+
+# Counting stats kept with exponential decay (derived stats are recomputed from them)
+DECAYED_STATS = [
+    "assists",
+    "goals",
+    "ds",
+    "turnovers",
+    "games_played",
+    "points_played",
+    "o_points",
+    "d_points",
+    "holds",
+    "breaks",
+]
+
+# Key of the decayed totals in each player's data (see apply_decayed_stats)
+DECAYED_STATS_KEY = "decayed_stats"
+
+# Stat credited to each event column, per action (same rules as set_players_stats)
+ACTION_STATS = {
+    "Goal": [("Passer", "assists"), ("Receiver", "goals")],
+    "D": [("Defender", "ds")],
+    "Throwaway": [("Passer", "turnovers")],
+    "Drop": [("Receiver", "turnovers")],
+}
+
+
+def create_decayed_aggregator(half_life=60, key="date"):
+    """
+    Empty streaming aggregator of exponentially decayed stats.
+
+    key "date" measures time in days (half_life in days); key "tournament"
+    measures it in tournaments, numbered in the order they are first seen
+    (half_life in tournaments).
+
+    Each player keeps one value per stat as of the time of its last event, so
+    an event is folded in with a single multiply-add and no history is kept.
+    teams records how much of each team's export has been consumed, so the
+    same export can be fed again on the next run and only new rows count.
+
+    games_played follows set_players_stats: one game per distinct opponent
+    within a tournament, credited at the time of the first row seen for it.
+    """
+    if key not in DECAY_KEYS:
+        raise ValueError(f"key must be one of: {', '.join(DECAY_KEYS)}")
+    return {
+        "version": DECAYED_STATE_VERSION,
+        "half_life": half_life,
+        "key": key,
+        "now": None,
+        "tournament_order": {},
+        "teams": {},
+        "players": {},
+    }
+
+
+def _decay(aggregator, elapsed):
+    return 0.5 ** (elapsed / aggregator["half_life"])
+
+
+def _event_time(aggregator, row):
+    if aggregator["key"] == "tournament":
+        order = aggregator["tournament_order"]
+        tourney = row.get("Tournamemnt", "")
+        if tourney not in order:
+            order[tourney] = len(order)
+        return order[tourney]
+
+    try:
+        return date.fromisoformat(row.get("Date/Time", "")[:10]).toordinal()
+    except ValueError:
+        return aggregator["now"]
+
+
+def _add(aggregator, player, stat, amount, t):
+    """
+    Fold one event into a player's decayed totals, in O(1).
+
+    An event without a usable date counts at the player's latest time, or the
+    aggregator's. Before any dated event it counts in full and starts decaying
+    from the first dated one.
+    """
+    if t is None:
+        t = player["t"] if player["t"] is not None else aggregator["now"]
+    if t is None:
+        player["stats"][stat] += amount
+        return
+    if player["t"] is None:
+        player["t"] = t
+    if t >= player["t"]:
+        factor = _decay(aggregator, t - player["t"])
+        if factor != 1.0:
+            for name in player["stats"]:
+                player["stats"][name] *= factor
+        player["t"] = t
+        player["stats"][stat] += amount
+    else:
+        # Late event: discount it to the player's current reference time
+        player["stats"][stat] += amount * _decay(aggregator, player["t"] - t)
+
+    if aggregator["now"] is None or player["t"] > aggregator["now"]:
+        aggregator["now"] = player["t"]
+
+
+def _rows_digest(whole_csv, count):
+    digest = hashlib.sha1()
+    for row in whole_csv[:count]:
+        digest.update(json.dumps(row, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def update_decayed_stats(aggregator, team_name, whole_csv):
+    """
+    Stream a team's export rows into the aggregator.
+
+    Rows already consumed on an earlier call are skipped. If the export no
+    longer starts with the rows consumed before (edited or re-recorded), the
+    team's totals are rebuilt from the whole export.
+
+    Returns:
+        Number of rows consumed
+    """
+    team_state = aggregator["teams"].get(team_name)
+    start = 0
+    if team_state is not None and team_state["rows"] <= len(whole_csv):
+        if _rows_digest(whole_csv, team_state["rows"]) == team_state["digest"]:
+            start = team_state["rows"]
+    if start == 0:
+        aggregator["players"][team_name] = {}
+        team_state = {"rows": 0, "digest": None}
+    team_players = aggregator["players"].setdefault(team_name, {})
+
+    def player_state(name):
+        player = team_players.get(name)
+        if player is None:
+            player = {"t": None, "games": {}, "stats": {stat: 0.0 for stat in DECAYED_STATS}}
+            team_players[name] = player
+        return player
+
+    for row in whole_csv[start:]:
+        t = _event_time(aggregator, row)
+        action = row.get("Action", "")
+        game = f'{row.get("Tournamemnt", "")}\x1f{row.get("Opponent", "")}'
+
+        for column, stat in ACTION_STATS.get(action, []):
+            name = row.get(column, "")
+            if name:
+                _add(aggregator, player_state(name), stat, 1, t)
+
+        point_over = action == "Goal"
+        we_scored = point_over and row.get("Event Type", "") == "Offense"
+        line = row.get("Line", "")
+        for i in range(7):
+            name = row.get(f"Player {i}", "")
+            if not name:
+                continue
+            player = player_state(name)
+            if game not in player["games"]:
+                player["games"][game] = True
+                _add(aggregator, player, "games_played", 1, t)
+            if point_over:
+                _add(aggregator, player, "points_played", 1, t)
+                if line == "O":
+                    _add(aggregator, player, "o_points", 1, t)
+                    if we_scored:
+                        _add(aggregator, player, "holds", 1, t)
+                elif line == "D":
+                    _add(aggregator, player, "d_points", 1, t)
+                    if we_scored:
+                        _add(aggregator, player, "breaks", 1, t)
+
+    team_state["rows"] = len(whole_csv)
+    team_state["digest"] = _rows_digest(whole_csv, len(whole_csv))
+    aggregator["teams"][team_name] = team_state
+    return len(whole_csv) - start
+
+
+def decayed_player_stats(aggregator, team_name, player_name, at=None):
+    """A player's decayed stat totals as of time `at` (default: latest event seen)."""
+    player = aggregator["players"].get(team_name, {}).get(player_name)
+    if player is None:
+        return {stat: 0.0 for stat in DECAYED_STATS}
+    if player["t"] is None:
+        # Only undated events so far: nothing to decay them from
+        return dict(player["stats"])
+    at = aggregator["now"] if at is None else at
+    factor = _decay(aggregator, max(at - player["t"], 0))
+    return {stat: value * factor for stat, value in player["stats"].items()}
+
+
+def apply_decayed_stats(aggregator, players_dict, at=None):
+    """
+    Store each player's decayed totals under players_dict[team][player][DECAYED_STATS_KEY].
+
+    The player's own counting stats are left as the raw integer counts shown
+    and published everywhere; the decayed totals (floats, with their derived
+    stats) are only read for scoring and pricing, through
+    calculate_all_scores(players_dict, DECAYED_STATS_KEY).
+    """
+    for team_name, players in players_dict.items():
+        for player_name, data in players.items():
+            stats = decayed_player_stats(aggregator, team_name, player_name, at)
+            set_derived_stats(stats)
+            data[DECAYED_STATS_KEY] = stats
+    return players_dict
+
+
+def save_decayed_aggregator(aggregator, path="decayed_stats.json"):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(aggregator, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_decayed_aggregator(path="decayed_stats.json", half_life=60, key="date"):
+    """
+    Load a saved aggregator, or start a new one if there is none, if it was
+    saved by an older layout, or if its half-life or key no longer match the
+    requested settings.
+    """
+    if os.path.exists(path):
+        with open(path) as f:
+            aggregator = json.load(f)
+        if (
+            aggregator.get("version") == DECAYED_STATE_VERSION
+            and aggregator.get("half_life") == half_life
+            and aggregator.get("key") == key
+        ):
+            return aggregator
+    return create_decayed_aggregator(half_life, key)
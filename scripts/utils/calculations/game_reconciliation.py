@@ -0,0 +1,142 @@
+from .player_identity import normalize_player_name
+
+
+def _score(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def summarize_games(whole_csv):
+    """
+    One summary per game of a team's export, in the order games first appear.
+
+    A game is the rows sharing a tournament, opponent and Date/Time (the
+    game's start). The final score is the highest end-of-point score seen,
+    so a trailing row with blank scores does not hide it.
+
+    Returns:
+        List of {"tournament", "opponent", "start", "our_score",
+        "their_score", "points"} dicts
+    """
+    games = {}
+    for row in whole_csv:
+        game_id = (
+            row.get("Tournamemnt", ""),
+            row.get("Opponent", ""),
+            row.get("Date/Time", ""),
+        )
+        game = games.get(game_id)
+        if game is None:
+            game = {
+                "tournament": game_id[0],
+                "opponent": game_id[1],
+                "start": game_id[2],
+                "our_score": 0,
+                "their_score": 0,
+                "points": 0,
+            }
+            games[game_id] = game
+
+        our_score = _score(row.get("Our Score - End of Point"))
+        their_score = _score(row.get("Their Score - End of Point"))
+        if our_score is not None and our_score > game["our_score"]:
+            game["our_score"] = our_score
+        if their_score is not None and their_score > game["their_score"]:
+            game["their_score"] = their_score
+        if row.get("Action", "") == "Goal":
+            game["points"] += 1
+
+    return list(games.values())
+
+
+def game_key(tournament_name, start, team_name, opponent):
+    """
+    Hashable key shared by both teams' copies of a game: tournament, day and
+    the unordered pair of teams, all compared case- and accent-insensitively.
+    """
+    return (
+        normalize_player_name(tournament_name),
+        start[:10],
+        frozenset((normalize_player_name(team_name), normalize_player_name(opponent))),
+    )
+
+
+def reconcile_games(team_games):
+    """
+    Pair up the two teams' copies of every game and check they agree.
+
+    Every game goes into a dict keyed by game_key, so pairing is one pass over
+    all games whatever the number of teams. Two games on the same day between
+    the same teams (a rematch) are paired in start time order.
+
+    Args:
+        team_games: Dictionary of {team_name: summarize_games(...) of its export}
+
+    Returns:
+        Dictionary with lists of "matched" and "mismatched" pairs, "missing"
+        games (the opponent is one of team_games but its export has no such
+        game) and "untracked" games (the opponent's export was not given).
+        Each item is {"key", "tournament", "date", "games": {team: summary}}.
+    """
+    index = {}
+    for team_name, games in team_games.items():
+        for game in games:
+            key = game_key(game["tournament"], game["start"], team_name, game["opponent"])
+            index.setdefault(key, {}).setdefault(team_name, []).append(game)
+
+    tracked = {normalize_player_name(team_name): team_name for team_name in team_games}
+    report = {"matched": [], "mismatched": [], "missing": [], "untracked": []}
+
+    for key, sides in index.items():
+        tournament_name, day, _ = key
+        for games in sides.values():
+            games.sort(key=lambda game: game["start"])
+
+        if len(sides) > 2:
+            # Several tracked teams normalize to the same name; nothing to pair
+            continue
+
+        if len(sides) == 1:
+            team_name, games = next(iter(sides.items()))
+            status = "missing" if normalize_player_name(games[0]["opponent"]) in tracked else "untracked"
+            for game in games:
+                report[status].append(
+                    {"key": key, "tournament": game["tournament"], "date": day, "games": {team_name: game}}
+                )
+            continue
+
+        (team_a, games_a), (team_b, games_b) = sides.items()
+        for i in range(max(len(games_a), len(games_b))):
+            if i >= len(games_a) or i >= len(games_b):
+                team_name, game = (team_a, games_a[i]) if i < len(games_a) else (team_b, games_b[i])
+                report["missing"].append(
+                    {"key": key, "tournament": game["tournament"], "date": day, "games": {team_name: game}}
+                )
+                continue
+
+            game_a, game_b = games_a[i], games_b[i]
+            agree = (
+                game_a["our_score"] == game_b["their_score"]
+                and game_a["their_score"] == game_b["our_score"]
+            )
+            report["matched" if agree else "mismatched"].append(
+                {
+                    "key": key,
+                    "tournament": game_a["tournament"],
+                    "date": day,
+                    "games": {team_a: game_a, team_b: game_b},
+                }
+            )
+
+    return report
+
+
+def describe_game_issue(issue):
+    """One-line description of a mismatched or missing game for logs."""
+    scores = ", ".join(
+        f"{team_name} has {game['our_score']}-{game['their_score']} vs {game['opponent']}"
+        for team_name, game in issue["games"].items()
+    )
+    return f"{issue['tournament']} {issue['date']}: {scores}"
@@ -1,10 +1,16 @@
 import csv
 
+from .player_identity import resolve_csv_names
 
-def set_players_and_teams(filename, players_dict, team_name):
+
+def set_players_and_teams(filename, players_dict, team_name, identity_index=None):
     with open(filename, newline="") as csvfile:
         whole_csv = list(csv.DictReader(csvfile))
 
+    # Merge spellings/aliases of the same player before anything is counted
+    if identity_index is not None:
+        resolve_csv_names(identity_index, team_name, whole_csv)
+
     if team_name not in players_dict:
         players_dict[team_name] = {}
 
@@ -11,6 +11,14 @@ def set_players_stats(players_dict, team_name, whole_csv):
             "tournamemnts": {},
             "games_played": 0,
             "questionable": False,
+            "plus_minus": 0,
+            "points_played": 0,
+            "o_points": 0,
+            "d_points": 0,
+            "holds": 0,
+            "breaks": 0,
+            "hold_pct": 0.0,
+            "break_pct": 0.0,
         }
 
     # Get Stats (avoiding anon and '')
@@ -38,7 +46,12 @@ def set_players_stats(players_dict, team_name, whole_csv):
             if reciever in players_dict[team_name]:
                 players_dict[team_name][reciever]["turnovers"] += 1
 
-        # Get games played for each player
+        # Every point ends in a goal for one side; credit the line on that row
+        point_over = row["Action"] == "Goal"
+        we_scored = point_over and row.get("Event Type", "") == "Offense"
+        line = row.get("Line", "")
+
+        # Get games played (and points played) for each player
         for i in range(7):
             name = row[f"Player {i}"]
             tourney = row["Tournamemnt"]
@@ -59,9 +72,30 @@ def set_players_stats(players_dict, team_name, whole_csv):
                         opponent
                     )
 
+                if point_over:
+                    players_dict[team_name][name]["points_played"] += 1
+                    if line == "O":
+                        players_dict[team_name][name]["o_points"] += 1
+                        if we_scored:
+                            players_dict[team_name][name]["holds"] += 1
+                    elif line == "D":
+                        players_dict[team_name][name]["d_points"] += 1
+                        if we_scored:
+                            players_dict[team_name][name]["breaks"] += 1
+
     for player in players_dict[team_name].values():
         for tourney in player["tournamemnts"].values():
             player["games_played"] += len(tourney)
+        set_derived_stats(player)
 
     # players_dict[team_name].pop('', None)
     return players_dict
+
+
+def set_derived_stats(player):
+    """Plus/minus and per-line efficiency from the counted stats."""
+    player["plus_minus"] = (
+        player["goals"] + player["assists"] + player["ds"] - player["turnovers"]
+    )
+    player["hold_pct"] = player["holds"] / player["o_points"] if player["o_points"] else 0.0
+    player["break_pct"] = player["breaks"] / player["d_points"] if player["d_points"] else 0.0
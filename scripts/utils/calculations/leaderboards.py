@@ -0,0 +1,254 @@
+from bisect import bisect_left, insort
+
+
+# Fields a leaderboard can be ordered by
+LEADERBOARD_ROLES = [
+    "captain_score",
+    "handler_score",
+    "cutter_score",
+    "defender_score",
+    "price",
+]
+
+# Target entries per block of a leaderboard index; blocks split at twice this
+LEADERBOARD_BLOCK_SIZE = 256
+
+
+def role_value(data, role):
+    """Value a player is ranked by for one role."""
+    if role == "price":
+        return data.get("price", 0)
+    return data.get("scores", {}).get(role, 0)
+
+
+def _entry(data, role, team_name, player_name):
+    # Negated value so the ascending sort puts the best player first;
+    # team and player names break ties deterministically
+    return (-role_value(data, role), team_name, player_name)
+
+
+def _block_counts(blocks):
+    """Fenwick tree over the block sizes (1-based, counts[0] unused)."""
+    counts = [0] + [len(block) for block in blocks]
+    for i in range(1, len(counts)):
+        parent = i + (i & -i)
+        if parent < len(counts):
+            counts[parent] += counts[i]
+    return counts
+
+
+def _add_count(counts, block, delta):
+    i = block + 1
+    while i < len(counts):
+        counts[i] += delta
+        i += i & -i
+
+
+def _entries_before_block(counts, block):
+    total = 0
+    i = block
+    while i > 0:
+        total += counts[i]
+        i -= i & -i
+    return total
+
+
+def _find_position(counts, position):
+    """(block, offset in block) of the entry at 0-based position."""
+    block = 0
+    step = 1 << (len(counts) - 1).bit_length()
+    while step:
+        nxt = block + step
+        if nxt < len(counts) and counts[nxt] <= position:
+            block = nxt
+            position -= counts[nxt]
+        step >>= 1
+    return block, position
+
+
+def _new_index(entries):
+    """
+    Ordered index over sorted entries: a list of sorted blocks with the last
+    entry of each (maxes) and a Fenwick tree of block sizes (counts).
+
+    Inserting or removing an entry bisects maxes and the block, shifts at most
+    2 * LEADERBOARD_BLOCK_SIZE entries and updates counts, so it costs
+    O(log n) plus a bounded shift; splitting or dropping a block rebuilds
+    counts, which happens at most once per LEADERBOARD_BLOCK_SIZE updates.
+    Ranks and positions are found through counts in O(log n).
+    """
+    blocks = [
+        entries[i:i + LEADERBOARD_BLOCK_SIZE]
+        for i in range(0, len(entries), LEADERBOARD_BLOCK_SIZE)
+    ]
+    return {
+        "blocks": blocks,
+        "maxes": [block[-1] for block in blocks],
+        "counts": _block_counts(blocks),
+        "size": len(entries),
+    }
+
+
+def _insert_entry(index, entry):
+    blocks = index["blocks"]
+    maxes = index["maxes"]
+    index["size"] += 1
+    if not blocks:
+        blocks.append([entry])
+        maxes.append(entry)
+        index["counts"] = _block_counts(blocks)
+        return
+
+    b = min(bisect_left(maxes, entry), len(blocks) - 1)
+    block = blocks[b]
+    insort(block, entry)
+    maxes[b] = block[-1]
+    if len(block) <= 2 * LEADERBOARD_BLOCK_SIZE:
+        _add_count(index["counts"], b, 1)
+        return
+
+    blocks[b:b + 1] = [block[:LEADERBOARD_BLOCK_SIZE], block[LEADERBOARD_BLOCK_SIZE:]]
+    maxes[b:b + 1] = [blocks[b][-1], blocks[b + 1][-1]]
+    index["counts"] = _block_counts(blocks)
+
+
+def _remove_entry(index, entry):
+    blocks = index["blocks"]
+    maxes = index["maxes"]
+    b = bisect_left(maxes, entry)
+    block = blocks[b]
+    del block[bisect_left(block, entry)]
+    index["size"] -= 1
+    if block:
+        maxes[b] = block[-1]
+        _add_count(index["counts"], b, -1)
+        return
+
+    del blocks[b]
+    del maxes[b]
+    index["counts"] = _block_counts(blocks)
+
+
+def _count_before(index, key):
+    """Number of entries that sort before key."""
+    b = bisect_left(index["maxes"], key)
+    if b == len(index["blocks"]):
+        return index["size"]
+    return _entries_before_block(index["counts"], b) + bisect_left(index["blocks"][b], key)
+
+
+def _entries_slice(index, start, stop):
+    """Entries at 0-based positions start to stop (exclusive), in order."""
+    stop = min(stop, index["size"])
+    if start >= stop:
+        return []
+    b, offset = _find_position(index["counts"], start)
+    entries = []
+    blocks = index["blocks"]
+    while len(entries) < stop - start:
+        entries.extend(blocks[b][offset:offset + stop - start - len(entries)])
+        b += 1
+        offset = 0
+    return entries
+
+
+def build_leaderboards(leaderboards, tournament_name, players_dict):
+    """
+    Build the ordered index of every role for one tournament.
+
+    leaderboards maps tournament name -> role -> {"index", "positions"}, where
+    index keeps the entries sorted (see _new_index) and positions maps
+    (team, player) to its entry.
+    """
+    boards = {}
+    for role in LEADERBOARD_ROLES:
+        positions = {}
+        for team_name, players in players_dict.items():
+            for player_name, data in players.items():
+                positions[(team_name, player_name)] = _entry(
+                    data, role, team_name, player_name
+                )
+        boards[role] = {"index": _new_index(sorted(positions.values())), "positions": positions}
+
+    leaderboards[tournament_name] = boards
+    return leaderboards
+
+
+def update_leaderboard_players(leaderboards, tournament_name, players_dict, changed_players):
+    """
+    Move only the changed players in every role index of a tournament, each
+    in O(log n) plus a bounded shift within one block.
+
+    changed_players is an iterable of (team, player); players no longer in
+    players_dict are removed from the leaderboards.
+    """
+    if tournament_name not in leaderboards:
+        return build_leaderboards(leaderboards, tournament_name, players_dict)
+
+    changed_players = list(changed_players)
+    for role, board in leaderboards[tournament_name].items():
+        index = board["index"]
+        positions = board["positions"]
+
+        for team_name, player_name in changed_players:
+            key = (team_name, player_name)
+            data = players_dict.get(team_name, {}).get(player_name)
+            old = positions.get(key)
+            new = None if data is None else _entry(data, role, team_name, player_name)
+            if old == new:
+                continue
+
+            if old is not None:
+                _remove_entry(index, old)
+                del positions[key]
+            if new is not None:
+                _insert_entry(index, new)
+                positions[key] = new
+
+    return leaderboards
+
+
+def _ranked(entries, start, role):
+    ranked = []
+    for offset, (neg_value, team_name, player_name) in enumerate(entries):
+        ranked.append(
+            {
+                "rank": start + offset + 1,
+                "team": team_name,
+                "player": player_name,
+                role: -neg_value,
+            }
+        )
+    return ranked
+
+
+def top_k(leaderboards, tournament_name, role, k):
+    """The k best players of a role, best first."""
+    index = leaderboards[tournament_name][role]["index"]
+    return _ranked(_entries_slice(index, 0, k), 0, role)
+
+
+def leaderboard_slice(leaderboards, tournament_name, role, offset, limit):
+    """limit players of a role leaderboard starting at 0-based position offset."""
+    index = leaderboards[tournament_name][role]["index"]
+    return _ranked(_entries_slice(index, offset, offset + limit), offset, role)
+
+
+def leaderboard_page(leaderboards, tournament_name, role, page, page_size=50):
+    """One page (0-based) of a role leaderboard."""
+    return leaderboard_slice(leaderboards, tournament_name, role, page * page_size, page_size)
+
+
+def rank_of_player(leaderboards, tournament_name, role, team_name, player_name):
+    """1-based rank of a player (tied players share the best rank), or None."""
+    board = leaderboards[tournament_name][role]
+    entry = board["positions"].get((team_name, player_name))
+    if entry is None:
+        return None
+    # Number of players with a strictly better value
+    return _count_before(board["index"], (entry[0],)) + 1
+
+
+def leaderboard_size(leaderboards, tournament_name, role):
+    """Number of players ranked in a role leaderboard."""
+    return leaderboards[tournament_name][role]["index"]["size"]
@@ -1,3 +1,6 @@
+from .player_identity import add_player_alias, find_player_candidates
+
+
 def initialize_empty_player():
     """Create a player entry with empty stats."""
     return {
@@ -8,10 +11,38 @@ def initialize_empty_player():
         "tournamemnts": {},
         "games_played": 0,
         "questionable": False,
+        "plus_minus": 0,
+        "points_played": 0,
+        "o_points": 0,
+        "d_points": 0,
+        "holds": 0,
+        "breaks": 0,
+        "hold_pct": 0.0,
+        "break_pct": 0.0,
     }
 
 
-def manage_players(players_dict, team_name):
+def suggest_player_name(identity_index, team_name, new_player):
+    """Offer the closest known spelling of a typed name; returns the name to use."""
+    candidates = find_player_candidates(identity_index, new_player, limit=1)
+    if not candidates:
+        return new_player
+
+    player_id, candidate_team, candidate_name, _ = candidates[0]
+    if candidate_name == new_player and candidate_team == team_name:
+        return new_player
+
+    answer = input(f"Did you mean '{candidate_name}' ({candidate_team})? (y/n): ").strip().lower()
+    if answer != "y":
+        return new_player
+
+    if candidate_team != team_name:
+        # Same person on another team: keep their name and link the identities
+        add_player_alias(identity_index, team_name, candidate_name, player_id)
+    return candidate_name
+
+
+def manage_players(players_dict, team_name, identity_index=None):
     """Import players that will be playing at next tournament, then allow adding more."""
     if team_name not in players_dict:
         players_dict[team_name] = {}
@@ -86,6 +117,9 @@ def manage_players(players_dict, team_name):
         if new_player == "-1":
             break
         
+        if new_player and identity_index is not None:
+            new_player = suggest_player_name(identity_index, team_name, new_player)
+
         if new_player:
             if new_player in players_dict[team_name]:
                 print(f"Player '{new_player}' already exists.")
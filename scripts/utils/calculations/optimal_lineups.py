@@ -0,0 +1,174 @@
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the lineup solver needs it
+    np = None
+
+
+# Slots per role in a lineup (a full line of seven)
+DEFAULT_LINEUP_SLOTS = {
+    "captain_score": 1,
+    "handler_score": 2,
+    "cutter_score": 2,
+    "defender_score": 2,
+}
+
+# Salary cap for a lineup; prices run 3-25
+DEFAULT_BUDGET = 100
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for the lineup solver. Install it with: pip install numpy")
+
+
+def _candidate_players(players_dict, slots, budget, top_n, skip_questionable):
+    """
+    Players that can appear in one of the top_n lineups.
+
+    A player is dropped from a role when at least sum(slots) + top_n - 1 other
+    players cost no more and score at least as much in it: a lineup can use
+    at most sum(slots) - 1 of them elsewhere, which leaves top_n ways to swap
+    the player for one of them without losing score or going over budget, so
+    no top_n lineup needs them. Each role is one sweep in price order with a
+    bounded heap of the best scores seen, so only the players on or near the
+    price/score frontier of some role reach the DP.
+    """
+    keep = sum(slots.values()) + top_n - 1
+    entries = []
+
+    for team_name, players in players_dict.items():
+        for player_name, data in players.items():
+            if skip_questionable and data.get("questionable", False):
+                continue
+            price = int(round(data.get("price", 0)))
+            if price > budget:
+                continue
+            entries.append((price, data.get("scores", {}), team_name, player_name))
+
+    candidates = set()
+    for role in slots:
+        best = []  # min-heap of the keep best scores at prices seen so far
+        for price, scores, team_name, player_name in sorted(
+            entries, key=lambda e: (e[0], -e[1].get(role, 0))
+        ):
+            score = scores.get(role, 0)
+            if len(best) < keep:
+                heapq.heappush(best, score)
+            elif score > best[0]:
+                heapq.heapreplace(best, score)
+            else:
+                continue
+            candidates.add((team_name, player_name))
+
+    return sorted(candidates)
+
+
+def solve_optimal_lineups(
+    players_dict, budget=DEFAULT_BUDGET, slots=None, top_n=1, skip_questionable=False
+):
+    """
+    Best lineups under a salary cap, using calculate_all_scores and
+    calculate_players_prices output.
+
+    Dynamic programming over (players filled per role, total integer price),
+    keeping the top_n values of every state. Each player fills at most one slot
+    and scores with the role of that slot. Players that cannot be in a top_n
+    lineup are pruned first (see _candidate_players), so the DP runs over a
+    few hundred players at most, whatever the size of players_dict.
+
+    Returns a list of up to top_n lineups, best first, each a dict with
+    "total", "cost" and "picks" (team, player, role, price, score).
+    """
+    _require_numpy()
+    slots = dict(DEFAULT_LINEUP_SLOTS if slots is None else slots)
+    roles = [role for role, count in slots.items() if count > 0]
+    if not roles:
+        return []
+
+    candidates = _candidate_players(players_dict, slots, budget, top_n, skip_questionable)
+    if not candidates:
+        return []
+
+    prices = []
+    scores = []
+    for team_name, player_name in candidates:
+        data = players_dict[team_name][player_name]
+        prices.append(int(round(data.get("price", 0))))
+        scores.append([data.get("scores", {}).get(role, 0) for role in roles])
+
+    shape = tuple(slots[role] + 1 for role in roles) + (budget + 1, top_n)
+    values = np.full(shape, -np.inf)
+    values[(0,) * len(roles) + (0, 0)] = 0.0
+
+    # Option o, rank k of a state is index o * top_n + k of the last axis:
+    # option 0 skips the player, option r + 1 puts them in role r
+    stacked = np.empty(shape[:-1] + ((len(roles) + 1) * top_n,))
+    rows = np.arange(int(np.prod(shape[:-1])))[:, np.newaxis]
+
+    backpointers = []
+    for price, player_scores in zip(prices, scores):
+        stacked.fill(-np.inf)
+        stacked[..., :top_n] = values
+        for r, score in enumerate(player_scores):
+            src = [slice(None)] * len(shape)
+            dst = [slice(None)] * (len(shape) - 1)
+            src[r] = slice(0, slots[roles[r]])
+            dst[r] = slice(1, None)
+            src[-2] = slice(0, budget + 1 - price)
+            dst[-1] = slice(price, None)
+            option = (r + 1) * top_n
+            stacked[tuple(dst) + (slice(option, option + top_n),)] = values[tuple(src)] + score
+
+        # Every state keeps a bounded top_n list: select it with a partial
+        # partition, then order only those top_n entries. Work on a flat
+        # (state, option rank) view, where gathers are plain row lookups.
+        by_state = stacked.reshape(-1, stacked.shape[-1])
+        if top_n == 1:
+            order = np.argmax(by_state, axis=-1)[:, np.newaxis]
+        else:
+            order = np.argpartition(by_state, by_state.shape[-1] - top_n, axis=-1)[:, -top_n:]
+            picked = by_state[rows, order]
+            order = order[rows, np.argsort(-picked, axis=-1, kind="stable")]
+        values = by_state[rows, order].reshape(shape)
+        backpointers.append(order.astype(np.int16).reshape(shape))
+
+    full = tuple(slots[role] for role in roles)
+    final = values[full]  # (budget + 1, top_n)
+    flat_order = np.argsort(-final, axis=None, kind="stable")[:top_n]
+
+    lineups = []
+    for flat in flat_order:
+        cost, rank = np.unravel_index(flat, final.shape)
+        total = final[cost, rank]
+        if not np.isfinite(total):
+            break
+
+        state = list(full)
+        c = int(cost)
+        k = int(rank)
+        picks = []
+        for i in range(len(candidates) - 1, -1, -1):
+            choice = int(backpointers[i][tuple(state) + (c, k)])
+            option, k = divmod(choice, top_n)
+            if option == 0:
+                continue
+            r = option - 1
+            team_name, player_name = candidates[i]
+            picks.append(
+                {
+                    "team": team_name,
+                    "player": player_name,
+                    "role": roles[r],
+                    "price": prices[i],
+                    "score": scores[i][r],
+                }
+            )
+            state[r] -= 1
+            c -= prices[i]
+
+        picks.reverse()
+        lineups.append({"total": float(total), "cost": int(cost), "picks": picks})
+
+    return lineups
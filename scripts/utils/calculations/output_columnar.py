@@ -0,0 +1,116 @@
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only the columnar outputs need it
+    pa = None
+
+
+# Rows buffered before a record batch / row group is written
+ROW_GROUP_SIZE = 10_000
+
+
+def players_schema():
+    """Arrow schema for the player outputs: typed numbers, list columns for games."""
+    _require_pyarrow()
+    return pa.schema(
+        [
+            ("team", pa.string()),
+            ("player", pa.string()),
+            (
+                "tournaments",
+                pa.list_(
+                    pa.struct([("name", pa.string()), ("games", pa.list_(pa.string()))])
+                ),
+            ),
+            ("games", pa.list_(pa.string())),
+            ("assists", pa.int32()),
+            ("goals", pa.int32()),
+            ("ds", pa.int32()),
+            ("turnovers", pa.int32()),
+            ("price", pa.float64()),
+            ("games_played", pa.int32()),
+            ("captain_score", pa.float64()),
+            ("handler_score", pa.float64()),
+            ("cutter_score", pa.float64()),
+            ("defender_score", pa.float64()),
+            ("questionable", pa.bool_()),
+        ]
+    )
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for Parquet/Arrow output. Install it with: pip install pyarrow"
+        )
+
+
+def iter_player_batches(players_dict, batch_size=ROW_GROUP_SIZE):
+    """Yield record batches of at most batch_size players."""
+    schema = players_schema()
+    columns = {name: [] for name in schema.names}
+    count = 0
+
+    for team_name, players in players_dict.items():
+        for player_name, data in players.items():
+            # Handle misspelling of "tournamemnts"
+            tournaments = data.get("tournamemnts", data.get("tournaments", {}))
+            tournament_list = []
+            games_all = []
+            for tournament_name, games in tournaments.items():
+                games_list = games if isinstance(games, list) else [str(games)]
+                games_all.extend(games_list)
+                tournament_list.append({"name": tournament_name, "games": games_list})
+
+            scores = data.get("scores", {})
+            columns["team"].append(team_name)
+            columns["player"].append(player_name)
+            columns["tournaments"].append(tournament_list)
+            columns["games"].append(games_all)
+            columns["assists"].append(data.get("assists", 0))
+            columns["goals"].append(data.get("goals", 0))
+            columns["ds"].append(data.get("ds", 0))
+            columns["turnovers"].append(data.get("turnovers", 0))
+            columns["price"].append(data.get("price", 0))
+            columns["games_played"].append(data.get("games_played", 0))
+            columns["captain_score"].append(scores.get("captain_score", 0))
+            columns["handler_score"].append(scores.get("handler_score", 0))
+            columns["cutter_score"].append(scores.get("cutter_score", 0))
+            columns["defender_score"].append(scores.get("defender_score", 0))
+            columns["questionable"].append(bool(data.get("questionable", False)))
+            count += 1
+
+            if count == batch_size:
+                yield pa.RecordBatch.from_pydict(columns, schema=schema)
+                columns = {name: [] for name in schema.names}
+                count = 0
+
+    if count:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def output_to_parquet_file(players_dict, filename="players.parquet"):
+    """Write players to Parquet, one row group per batch."""
+    schema = players_schema()
+    with pq.ParquetWriter(filename, schema, compression="zstd") as writer:
+        for batch in iter_player_batches(players_dict):
+            writer.write_batch(batch)
+
+
+def output_to_arrow_file(players_dict, filename="players.arrow"):
+    """Write players to an Arrow IPC file, which readers can memory-map."""
+    schema = players_schema()
+    with pa.OSFile(filename, "wb") as sink:
+        with ipc.new_file(sink, schema) as writer:
+            for batch in iter_player_batches(players_dict):
+                writer.write_batch(batch)
+
+
+def read_arrow_file(filename="players.arrow", columns=None):
+    """Memory-map an Arrow IPC players file, optionally selecting columns."""
+    _require_pyarrow()
+    # The table's buffers point into the mapping, so it stays open with the table
+    source = pa.memory_map(filename, "r")
+    table = ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
@@ -0,0 +1,172 @@
+import json
+import re
+import unicodedata
+
+
+# Export columns holding player names
+NAME_COLUMNS = ["Passer", "Receiver", "Defender"] + [f"Player {i}" for i in range(7)]
+
+# Placeholders the exports use instead of a player
+UNRESOLVED_NAMES = {"", "Anonymous"}
+
+
+def create_identity_index():
+    """
+    Empty player identity index.
+
+    Players get integer ids. keys maps (team, normalized name) to an id and
+    aliases maps (team, normalized alias) to an id, so an alias can also point
+    at a player listed under another team. ngrams is the trigram -> ids index
+    used for fuzzy lookups, and resolved caches every raw (team, string) seen.
+    """
+    return {
+        "names": [],
+        "teams": [],
+        "gram_counts": [],
+        "keys": {},
+        "aliases": {},
+        "ngrams": {},
+        "resolved": {},
+    }
+
+
+def normalize_player_name(name):
+    """Lowercase, accent-free, punctuation-free form of a name for matching."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = re.sub(r"[^\w\s]", "", name.lower())
+    return " ".join(name.split())
+
+
+def name_trigrams(normalized):
+    """Trigrams of a normalized name, padded so word starts weigh more."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def intern_player(index, team_name, name):
+    """Id of a player, added to the index on first sight."""
+    key = (team_name, normalize_player_name(name))
+    player_id = index["aliases"].get(key)
+    if player_id is None:
+        player_id = index["keys"].get(key)
+    if player_id is not None:
+        return player_id
+
+    player_id = len(index["names"])
+    index["names"].append(name)
+    index["teams"].append(team_name)
+    index["keys"][key] = player_id
+
+    grams = name_trigrams(key[1])
+    index["gram_counts"].append(len(grams))
+    for gram in grams:
+        index["ngrams"].setdefault(gram, set()).add(player_id)
+    return player_id
+
+
+def add_player_alias(index, team_name, alias, player_id):
+    """Make alias (as written on team_name's export) resolve to player_id."""
+    index["aliases"][(team_name, normalize_player_name(alias))] = player_id
+    # Earlier resolutions of this spelling may have pointed elsewhere
+    index["resolved"].pop((team_name, alias), None)
+
+
+def load_player_aliases(index, path):
+    """
+    Load an alias table from JSON:
+    [{"team": ..., "alias": ..., "player": ..., "player_team": ...}, ...]
+    where player_team defaults to team.
+
+    For an alias pointing at another team's player, the player's canonical
+    spelling is also registered as an alias on the alias's team: rows are
+    rewritten to that spelling, so later lookups of it under that team (e.g.
+    set_player_ids) must find the same player.
+    """
+    with open(path) as f:
+        entries = json.load(f)
+
+    for entry in entries:
+        player_team = entry.get("player_team", entry["team"])
+        player_id = intern_player(index, player_team, entry["player"])
+        add_player_alias(index, entry["team"], entry["alias"], player_id)
+        if player_team != entry["team"]:
+            add_player_alias(index, entry["team"], player_name(index, player_id), player_id)
+    return index
+
+
+def resolve_player(index, team_name, raw_name):
+    """Id for a name as written in an export, cached per distinct string."""
+    cache_key = (team_name, raw_name)
+    player_id = index["resolved"].get(cache_key)
+    if player_id is None:
+        player_id = intern_player(index, team_name, raw_name)
+        index["resolved"][cache_key] = player_id
+    return player_id
+
+
+def player_name(index, player_id):
+    """Canonical (first seen) name of a player id."""
+    return index["names"][player_id]
+
+
+def resolve_csv_names(index, team_name, whole_csv):
+    """
+    Rewrite every player name in a team's rows to its canonical spelling.
+
+    Each distinct string is resolved once; rows are then updated through a
+    plain dict lookup, so spellings and aliases of one player merge before
+    any stats are counted.
+    """
+    canonical = {}
+    for row in whole_csv:
+        for column in NAME_COLUMNS:
+            raw_name = row.get(column)
+            if raw_name is None or raw_name in UNRESOLVED_NAMES:
+                continue
+            name = canonical.get(raw_name)
+            if name is None:
+                name = player_name(index, resolve_player(index, team_name, raw_name))
+                canonical[raw_name] = name
+            row[column] = name
+    return whole_csv
+
+
+def set_player_ids(index, players_dict):
+    """
+    Store each player's integer id as "player_id" in players_dict.
+
+    Ids follow the order players were first interned in this run, so they are
+    only comparable within one run, not stable identifiers.
+    """
+    for team_name, players in players_dict.items():
+        for name, data in players.items():
+            data["player_id"] = resolve_player(index, team_name, name)
+    return players_dict
+
+
+def find_player_candidates(index, name, team_name=None, limit=5, min_similarity=0.3):
+    """
+    Players whose names look like name, best first, by trigram similarity.
+
+    Returns (player_id, team, name, similarity) tuples, optionally limited to
+    one team.
+    """
+    grams = name_trigrams(normalize_player_name(name))
+    shared = {}
+    for gram in grams:
+        for player_id in index["ngrams"].get(gram, ()):
+            shared[player_id] = shared.get(player_id, 0) + 1
+
+    candidates = []
+    for player_id, count in shared.items():
+        if team_name is not None and index["teams"][player_id] != team_name:
+            continue
+        similarity = count / (len(grams) + index["gram_counts"][player_id] - count)
+        if similarity >= min_similarity:
+            candidates.append(
+                (player_id, index["teams"][player_id], index["names"][player_id], similarity)
+            )
+
+    candidates.sort(key=lambda c: (-c[3], c[0]))
+    return candidates[:limit]
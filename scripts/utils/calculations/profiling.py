@@ -0,0 +1,203 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+PROFILE_FLAG = "--profile"
+
+# Frames kept per allocation, so allocations can be traced back to their callers
+TRACEMALLOC_FRAMES = 25
+
+REPORT_TOP_FUNCTIONS = 25
+REPORT_TOP_ALLOCATIONS = 15
+
+
+def profiling_requested(argv=None):
+    """True when the command line asks for a profiling run."""
+    return PROFILE_FLAG in (sys.argv[1:] if argv is None else argv)
+
+
+def create_profiler(enabled, output_dir="profiles"):
+    """
+    Profiling state for one run.
+
+    When enabled, reports go to a timestamped folder under output_dir; when
+    disabled, profile_stage does nothing, so call sites need no branching.
+    """
+    if enabled:
+        output_dir = os.path.join(output_dir, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(output_dir, exist_ok=True)
+    return {"enabled": enabled, "output_dir": output_dir, "stages": []}
+
+
+def _stage_filename(profiler, name):
+    slug = re.sub(r"[^\w.-]+", "_", name).strip("_") or "stage"
+    return os.path.join(profiler["output_dir"], f"{len(profiler['stages']):02d}_{slug}")
+
+
+def _function_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-ins, e.g. <method 'append' of 'list' objects>
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def collapsed_stacks(stats):
+    """
+    Flamegraph "collapsed stack" lines (frame;frame;frame microseconds).
+
+    cProfile only records caller -> callee edges, so each function's own time
+    is split across the paths leading to it by the share of its cumulative
+    time spent under each caller. Recursive edges are cut at the first repeat.
+
+    A path is only followed while its share of time is at least a microsecond:
+    the time under every path through a function adds up to the function's
+    cumulative time, so the number of paths walked is bounded by the profile's
+    total microseconds however many ways shared helpers are reached.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    lines = {}
+    on_stack = set()
+
+    def walk(func, path, share):
+        _, _, own_time, cumulative, _ = entries[func]
+        if share * cumulative * 1e6 < 1:
+            return
+        stack = path + [_function_label(func)]
+        micros = int(own_time * share * 1e6)
+        if micros > 0:
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0) + micros
+        on_stack.add(func)
+        for callee, edge_cumulative in callees.get(func, []):
+            callee_cumulative = entries[callee][3]
+            if callee_cumulative <= 0 or callee in on_stack:
+                continue
+            walk(callee, stack, share * edge_cumulative / callee_cumulative)
+        on_stack.discard(func)
+
+    for root in roots:
+        walk(root, [], 1.0)
+
+    return [f"{stack} {micros}" for stack, micros in sorted(lines.items())]
+
+
+def _write_stage_report(path, stage, stats, allocations):
+    with open(path, "w") as f:
+        f.write(f"Stage: {stage['name']}\n")
+        f.write(f"Wall time: {stage['seconds']:.3f}s\n")
+        f.write(f"Peak traced memory: {stage['peak_bytes'] / 2**20:.2f} MiB\n")
+        f.write(f"Net allocated: {stage['net_bytes'] / 2**20:+.2f} MiB\n")
+
+        f.write(f"\nTop {REPORT_TOP_FUNCTIONS} functions by cumulative time\n")
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats("cumulative").print_stats(REPORT_TOP_FUNCTIONS)
+        f.write(buffer.getvalue())
+
+        f.write(f"\nTop {REPORT_TOP_ALLOCATIONS} allocations by line (net of stage start)\n")
+        for diff in allocations[:REPORT_TOP_ALLOCATIONS]:
+            frame = diff.traceback[0]
+            f.write(
+                f"  {diff.size_diff / 1024:10.1f} KiB  {diff.count_diff:8d} blocks  "
+                f"{frame.filename}:{frame.lineno}\n"
+            )
+
+
+@contextmanager
+def profile_stage(profiler, name):
+    """
+    Profile the wrapped block with cProfile and tracemalloc.
+
+    Writes <NN>_<name>.prof (pstats, for snakeviz and friends), .folded
+    (collapsed stacks for flamegraph.pl / speedscope) and .txt (top functions,
+    peak memory and allocations by line) to the profiler's folder. Stages
+    should not be nested: only one cProfile profiler can be active at a time.
+    """
+    if not profiler["enabled"]:
+        yield
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    start_snapshot = tracemalloc.take_snapshot()
+    start_memory, _ = tracemalloc.get_traced_memory()
+
+    profile = cProfile.Profile()
+    started = time.perf_counter()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        seconds = time.perf_counter() - started
+        end_memory, peak_memory = tracemalloc.get_traced_memory()
+        end_snapshot = tracemalloc.take_snapshot()
+
+        base = _stage_filename(profiler, name)
+        stage = {
+            "name": name,
+            "seconds": seconds,
+            "peak_bytes": peak_memory - start_memory,
+            "net_bytes": end_memory - start_memory,
+            "report": base + ".txt",
+        }
+
+        profile.dump_stats(base + ".prof")
+        stats = pstats.Stats(profile)
+        with open(base + ".folded", "w") as f:
+            f.write("\n".join(collapsed_stacks(stats)) + "\n")
+
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        allocations = end_snapshot.filter_traces(filters).compare_to(
+            start_snapshot.filter_traces(filters), "lineno"
+        )
+        _write_stage_report(base + ".txt", stage, stats, allocations)
+
+        profiler["stages"].append(stage)
+        print(
+            f"  ⏱ {name}: {seconds:.3f}s, peak {stage['peak_bytes'] / 2**20:.2f} MiB "
+            f"→ {stage['report']}"
+        )
+
+
+def write_profile_summary(profiler):
+    """Write and print the per-stage totals of a profiling run."""
+    if not profiler["enabled"] or not profiler["stages"]:
+        return None
+
+    lines = [f"{'Stage':<40} {'Seconds':>10} {'Peak MiB':>10} {'Net MiB':>10}"]
+    for stage in profiler["stages"]:
+        lines.append(
+            f"{stage['name']:<40} {stage['seconds']:>10.3f} "
+            f"{stage['peak_bytes'] / 2**20:>10.2f} {stage['net_bytes'] / 2**20:>+10.2f}"
+        )
+    lines.append(f"{'Total':<40} {sum(s['seconds'] for s in profiler['stages']):>10.3f}")
+
+    path = os.path.join(profiler["output_dir"], "summary.txt")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+    print("\nProfile summary:")
+    for line in lines:
+        print(f"  {line}")
+    print(f"✓ Profiles written to {profiler['output_dir']}")
+    tracemalloc.stop()
+    return path
@@ -0,0 +1,156 @@
+from math import gcd
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only projections need it
+    np = None
+
+from .calculate_scores import SCORE_WEIGHTS
+
+
+# Per-game stats the projection samples
+PROJECTION_STATS = ["assists", "goals", "ds", "turnovers"]
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Poisson mass beyond this many standard deviations is dropped
+TAIL_SIGMAS = 10
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for projections. Install it with: pip install numpy")
+
+
+def per_game_rates(players_dict):
+    """
+    Average assists, goals, Ds and turnovers per game for every player.
+
+    Returns the (team, player) keys and a (players, stats) array of rates;
+    players without games played get zero rates.
+    """
+    _require_numpy()
+    keys = []
+    rates = []
+    for team_name, players in players_dict.items():
+        for player_name, data in players.items():
+            games_played = data.get("games_played", 0)
+            keys.append((team_name, player_name))
+            if games_played:
+                rates.append([data.get(stat, 0) / games_played for stat in PROJECTION_STATS])
+            else:
+                rates.append([0.0] * len(PROJECTION_STATS))
+
+    return keys, np.array(rates, dtype=np.float64).reshape(len(keys), len(PROJECTION_STATS))
+
+
+def _poisson_pmf(lam, max_count):
+    """Poisson pmf of every rate for counts 0..max_count, shape (players, max_count + 1)."""
+    counts = np.arange(max_count + 1)
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, max_count + 1)))])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_lam = np.log(lam)[:, np.newaxis]
+        log_pmf = counts * log_lam - lam[:, np.newaxis] - log_factorial
+    # lam == 0 puts all mass on a count of zero
+    log_pmf[lam == 0] = -np.inf
+    log_pmf[lam == 0, 0] = 0.0
+    return np.exp(log_pmf)
+
+
+def _role_score_pmf(lams, weights, max_count):
+    """
+    Distribution of one role score for every player.
+
+    Stat counts are independent Poisson draws, so the score pmf is the
+    convolution of each stat's pmf spread over multiples of its weight. All
+    players are convolved at once through the FFT.
+
+    Returns (scores, pmf) where scores[i] is the score of pmf[:, i].
+    """
+    # Scores only land on multiples of the weights' gcd, so work in those steps
+    step = gcd(*weights) or 1
+    weights = [w // step for w in weights]
+
+    low = sum(min(0, w) for w in weights) * max_count
+    high = sum(max(0, w) for w in weights) * max_count
+    size = high - low + 1
+    fft_size = 1 << (size - 1).bit_length()
+
+    spectrum = np.ones((lams.shape[0], fft_size // 2 + 1), dtype=np.complex128)
+    counts = np.arange(max_count + 1)
+    for s, weight in enumerate(weights):
+        if weight == 0:
+            continue
+        pmf = _poisson_pmf(lams[:, s], max_count)
+        spread = np.zeros((lams.shape[0], fft_size))
+        # Shift negative weights so every stat's support starts at index 0
+        positions = weight * counts - (min(0, weight) * max_count)
+        spread[:, positions] = pmf
+        spectrum *= np.fft.rfft(spread, axis=1)
+
+    score_pmf = np.fft.irfft(spectrum, n=fft_size, axis=1)[:, :size]
+    score_pmf = np.clip(score_pmf, 0.0, None)
+    score_pmf /= score_pmf.sum(axis=1, keepdims=True)
+    return np.arange(low, high + 1) * step, score_pmf
+
+
+def project_players(
+    players_dict, n_games=1, n_sims=100_000, percentiles=DEFAULT_PERCENTILES, seed=None
+):
+    """
+    Monte Carlo projection of every role score over the next n_games games.
+
+    Each stat is modelled as Poisson at the player's per-game rate. Instead of
+    drawing n_sims score samples per player, the histogram of n_sims simulated
+    outcomes is drawn directly (one multinomial per player over the score
+    support), which has the same distribution and costs the same for 1k or 1M
+    simulations.
+
+    Adds players_dict[team][player]["projection"][role] with "expected" and
+    "p<N>" bands for each role in SCORE_WEIGHTS. Raises ValueError if a role
+    weights a stat outside PROJECTION_STATS (e.g. plus_minus), rather than
+    projecting a score that silently leaves it out.
+    """
+    keys, rates = per_game_rates(players_dict)
+    if not keys:
+        return players_dict
+
+    rng = np.random.default_rng(seed)
+    lams = rates * n_games
+    lam_max = float(lams.max())
+    max_count = int(np.ceil(lam_max + TAIL_SIGMAS * np.sqrt(lam_max))) + TAIL_SIGMAS
+    quantiles = np.asarray(percentiles, dtype=np.float64) / 100
+
+    projections = [{} for _ in keys]
+    for role, role_weights in SCORE_WEIGHTS.items():
+        unprojected = [
+            stat for stat, weight in role_weights.items()
+            if weight and stat not in PROJECTION_STATS
+        ]
+        if unprojected:
+            raise ValueError(
+                f"Projections only model {', '.join(PROJECTION_STATS)}; "
+                f"{role} also weights {', '.join(unprojected)}"
+            )
+        weights = [role_weights.get(stat, 0) for stat in PROJECTION_STATS]
+        if any(weight != int(weight) for weight in weights):
+            raise ValueError(f"Projections need integer weights for {role}: {weights}")
+        weights = [int(weight) for weight in weights]
+        scores, pmf = _role_score_pmf(lams, weights, max_count)
+
+        histograms = rng.multinomial(n_sims, pmf)
+        expected = histograms @ scores / n_sims
+        cumulative = np.cumsum(histograms, axis=1) / n_sims
+        # First score whose cumulative share reaches each percentile
+        bands = (cumulative[:, np.newaxis, :] >= quantiles[np.newaxis, :, np.newaxis] - 1e-12).argmax(axis=2)
+
+        for i in range(len(keys)):
+            projection = {"expected": float(expected[i])}
+            for j, percentile in enumerate(percentiles):
+                projection[f"p{percentile}"] = int(scores[bands[i, j]])
+            projections[i][role] = projection
+
+    for (team_name, player_name), projection in zip(keys, projections):
+        players_dict[team_name][player_name]["projection"] = projection
+
+    return players_dict
@@ -0,0 +1,265 @@
+import json
+import os
+from collections import Counter
+
+from .calculate_scores import SCORE_WEIGHTS
+from .get_stats import set_derived_stats
+
+
+REPLAY_CHECKPOINTS = ["point", "game", "round"]
+
+# Stat credited to each event column, per action (same rules as set_players_stats)
+ACTION_STATS = {
+    "Goal": [("Passer", "assists"), ("Receiver", "goals")],
+    "D": [("Defender", "ds")],
+    "Throwaway": [("Passer", "turnovers")],
+    "Drop": [("Receiver", "turnovers")],
+}
+
+# How each counted stat moves plus/minus
+PLUS_MINUS_SIGNS = {"assists": 1, "goals": 1, "ds": 1, "turnovers": -1}
+
+PRICE_MIN = 3
+PRICE_MAX = 25
+
+
+def _ordered_rows(team_rows):
+    """Order every team's rows by Date/Time (the game), keeping each export's own point order."""
+    keyed = []
+    for team_index, (team_name, rows) in enumerate(team_rows.items()):
+        for row_index, row in enumerate(rows):
+            keyed.append((row.get("Date/Time", ""), team_index, row_index, team_name, row))
+    keyed.sort(key=lambda k: k[:3])
+    for _, _, _, team_name, row in keyed:
+        yield team_name, row
+
+
+def _new_player():
+    return {
+        "assists": 0,
+        "goals": 0,
+        "ds": 0,
+        "turnovers": 0,
+        "tournamemnts": {},
+        "games_played": 0,
+        "questionable": False,
+        "plus_minus": 0,
+        "points_played": 0,
+        "o_points": 0,
+        "d_points": 0,
+        "holds": 0,
+        "breaks": 0,
+        "hold_pct": 0.0,
+        "break_pct": 0.0,
+        "scores": {role: 0 for role in SCORE_WEIGHTS},
+        "price": 0,
+    }
+
+
+def _price(score, cap_min, cap_max):
+    if cap_max == cap_min:
+        return PRICE_MIN
+    return round(PRICE_MIN + (PRICE_MAX - PRICE_MIN) * (score - cap_min) / (cap_max - cap_min))
+
+
+def replay_events(team_rows, checkpoint="game"):
+    """
+    Replay event rows in game and point order, yielding cumulative snapshots.
+
+    team_rows maps team name -> export rows (e.g. filtered by tournament).
+    Yields (checkpoint_index, label, players_dict, changed) at the end of every
+    point, game or round ("round" is each team's n-th game of a tournament),
+    where changed is the set of (team, player) whose stats, scores or price
+    moved since the previous checkpoint.
+
+    Stats and scores are updated per event and prices are only recomputed for
+    changed players, unless the captain score range moved. The same
+    players_dict is yielded every time and updated in place; copy it to keep a
+    checkpoint.
+    """
+    if checkpoint not in REPLAY_CHECKPOINTS:
+        raise ValueError(f"checkpoint must be one of: {', '.join(REPLAY_CHECKPOINTS)}")
+
+    players_dict = {team_name: {} for team_name in team_rows}
+    captain_scores = Counter()
+    cap_range = None
+    priced_range = None
+    dirty = set()
+    changed = set()
+
+    game_keys = {}
+    game_ordinals = {}
+    current_label = None
+    index = 0
+
+    def add_to_score(team_name, name, stat, delta):
+        nonlocal cap_range
+        player = players_dict[team_name][name]
+        player[stat] += delta
+        old_captain = player["scores"]["captain_score"]
+        for role, weights in SCORE_WEIGHTS.items():
+            player["scores"][role] += weights.get(stat, 0) * delta
+        new_captain = player["scores"]["captain_score"]
+
+        if new_captain != old_captain:
+            captain_scores[old_captain] -= 1
+            if not captain_scores[old_captain]:
+                del captain_scores[old_captain]
+            captain_scores[new_captain] += 1
+            low, high = cap_range
+            if old_captain in (low, high) and old_captain not in captain_scores:
+                cap_range = (min(captain_scores), max(captain_scores))
+            else:
+                cap_range = (min(low, new_captain), max(high, new_captain))
+        dirty.add((team_name, name))
+
+        if stat in PLUS_MINUS_SIGNS:
+            add_to_score(team_name, name, "plus_minus", PLUS_MINUS_SIGNS[stat] * delta)
+
+    def reprice():
+        nonlocal priced_range
+        if cap_range is None:
+            return
+        low, high = cap_range
+        if cap_range != priced_range:
+            to_price = [(t, p) for t in players_dict for p in players_dict[t]]
+            priced_range = cap_range
+        else:
+            to_price = dirty
+        for team_name, name in to_price:
+            player = players_dict[team_name][name]
+            price = _price(player["scores"]["captain_score"], low, high)
+            if price != player["price"]:
+                player["price"] = price
+                changed.add((team_name, name))
+        changed.update(dirty)
+        dirty.clear()
+
+    for team_name, row in _ordered_rows(team_rows):
+        tourney = row.get("Tournamemnt", "")
+        opponent = row.get("Opponent", "")
+        game_date = row.get("Date/Time", "")[:10]
+
+        game_key = (tourney, opponent, game_date)
+        if game_keys.get(team_name) != game_key:
+            game_keys[team_name] = game_key
+            ordinal_key = (team_name, tourney)
+            game_ordinals[ordinal_key] = game_ordinals.get(ordinal_key, 0) + 1
+
+        if checkpoint == "point":
+            label = (
+                f"{team_name} vs {opponent} ({tourney}, {game_date}) "
+                f"{row.get('Our Score - End of Point', '')}-{row.get('Their Score - End of Point', '')}"
+            )
+        elif checkpoint == "game":
+            label = f"{team_name} vs {opponent} ({tourney}, {game_date})"
+        else:
+            label = f"{tourney} round {game_ordinals[(team_name, tourney)]}"
+
+        if current_label is not None and label != current_label:
+            reprice()
+            yield index, current_label, players_dict, changed
+            index += 1
+            changed = set()
+        current_label = label
+
+        team_players = players_dict[team_name]
+        for i in range(7):
+            name = row.get(f"Player {i}", "")
+            if not name:
+                continue
+            if name not in team_players:
+                team_players[name] = _new_player()
+                captain_scores[0] += 1
+                cap_range = (0, 0) if cap_range is None else (min(cap_range[0], 0), max(cap_range[1], 0))
+                dirty.add((team_name, name))
+
+            games = team_players[name]["tournamemnts"].setdefault(tourney, [])
+            if opponent not in games:
+                games.append(opponent)
+                team_players[name]["games_played"] += 1
+                dirty.add((team_name, name))
+
+        for column, stat in ACTION_STATS.get(row.get("Action", ""), []):
+            name = row.get(column, "")
+            if name in team_players:
+                add_to_score(team_name, name, stat, 1)
+
+        # Every point ends in a goal for one side; credit the line on that row
+        if row.get("Action", "") == "Goal":
+            we_scored = row.get("Event Type", "") == "Offense"
+            line = row.get("Line", "")
+            for i in range(7):
+                name = row.get(f"Player {i}", "")
+                if name not in team_players:
+                    continue
+                add_to_score(team_name, name, "points_played", 1)
+                if line == "O":
+                    add_to_score(team_name, name, "o_points", 1)
+                    if we_scored:
+                        add_to_score(team_name, name, "holds", 1)
+                elif line == "D":
+                    add_to_score(team_name, name, "d_points", 1)
+                    if we_scored:
+                        add_to_score(team_name, name, "breaks", 1)
+                set_derived_stats(team_players[name])
+
+    if current_label is not None:
+        reprice()
+        yield index, current_label, players_dict, changed
+
+
+def write_replay_history(path, team_rows, checkpoint="game"):
+    """
+    Write a replay to a JSON-lines history file for charting.
+
+    Each line is one checkpoint and only lists the players that changed:
+    [team, player, price, captain, handler, cutter, defender]. The file holds
+    exactly one replay: it is written next to path and then replaces it, so
+    checkpoint numbers never repeat within a file.
+    """
+    written = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        for index, label, players_dict, changed in replay_events(team_rows, checkpoint):
+            rows = []
+            for team_name, name in sorted(changed):
+                player = players_dict[team_name][name]
+                scores = player["scores"]
+                rows.append(
+                    [
+                        team_name,
+                        name,
+                        player["price"],
+                        scores["captain_score"],
+                        scores["handler_score"],
+                        scores["cutter_score"],
+                        scores["defender_score"],
+                    ]
+                )
+            f.write(
+                json.dumps({"checkpoint": index, "label": label, "players": rows}, separators=(",", ":"))
+                + "\n"
+            )
+            written += 1
+    os.replace(tmp_path, path)
+    return written
+
+
+def load_replay_history(path):
+    """
+    Read a replay history back into one series per player.
+
+    Returns {(team, player): [(checkpoint, label, price, captain, handler,
+    cutter, defender), ...]} with an entry at every checkpoint where the player
+    changed.
+    """
+    series = {}
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            for team_name, name, *values in entry["players"]:
+                series.setdefault((team_name, name), []).append(
+                    (entry["checkpoint"], entry["label"], *values)
+                )
+    return series
@@ -0,0 +1,184 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only roster scoring needs it
+    np = None
+
+
+# Role slots a pick can be scored in; each pick uses the matching player score
+ROSTER_ROLES = [
+    "captain_score",
+    "handler_score",
+    "cutter_score",
+    "defender_score",
+]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for roster scoring. Install it with: pip install numpy")
+
+
+def create_roster_book():
+    """
+    Empty store for user rosters.
+
+    Picks are kept as a sparse player x roster matrix in coordinate form: pick i
+    puts player pick_players[i] in roster pick_rosters[i] using role pick_roles[i].
+    player_picks is the reverse index from a player row to the picks using it.
+    """
+    _require_numpy()
+    return {
+        "player_index": {},
+        "players": [],
+        "roster_index": {},
+        "rosters": [],
+        "pick_rosters": [],
+        "pick_players": [],
+        "pick_roles": [],
+        "roster_picks": {},
+        "player_picks": {},
+        "arrays": None,
+        "scores": np.zeros((0, len(ROSTER_ROLES))),
+        "totals": np.zeros(0),
+    }
+
+
+def _player_row(book, team_name, player_name):
+    key = (team_name, player_name)
+    row = book["player_index"].get(key)
+    if row is None:
+        row = len(book["players"])
+        book["player_index"][key] = row
+        book["players"].append(key)
+        book["player_picks"][row] = []
+    return row
+
+
+def set_roster(book, roster_id, picks):
+    """
+    Add or replace a user roster.
+
+    picks is a list of (team, player, role) with role one of ROSTER_ROLES.
+    Totals are brought up to date by the next compute_roster_totals call.
+    """
+    column = book["roster_index"].get(roster_id)
+    if column is None:
+        column = len(book["rosters"])
+        book["roster_index"][roster_id] = column
+        book["rosters"].append(roster_id)
+    else:
+        _drop_picks(book, set(book["roster_picks"][column]))
+
+    book["roster_picks"][column] = []
+    for team_name, player_name, role in picks:
+        if role not in ROSTER_ROLES:
+            raise ValueError(f"Unknown roster role '{role}'. Use one of: {', '.join(ROSTER_ROLES)}")
+        row = _player_row(book, team_name, player_name)
+        pick = len(book["pick_rosters"])
+        book["pick_rosters"].append(column)
+        book["pick_players"].append(row)
+        book["pick_roles"].append(ROSTER_ROLES.index(role))
+        book["roster_picks"][column].append(pick)
+        book["player_picks"][row].append(pick)
+
+    book["arrays"] = None
+    return book
+
+
+def _drop_picks(book, dropped):
+    """
+    Remove picks from the coordinate lists, renumbering the ones kept.
+
+    Replacing a roster rebuilds the pick arrays anyway, so compacting here
+    costs no more and keeps the matrix at the size of the live picks.
+    """
+    kept = [pick for pick in range(len(book["pick_rosters"])) if pick not in dropped]
+    for key in ("pick_rosters", "pick_players", "pick_roles"):
+        book[key] = [book[key][pick] for pick in kept]
+
+    book["roster_picks"] = {column: [] for column in book["roster_picks"]}
+    book["player_picks"] = {row: [] for row in book["player_picks"]}
+    for pick, (column, row) in enumerate(zip(book["pick_rosters"], book["pick_players"])):
+        book["roster_picks"][column].append(pick)
+        book["player_picks"][row].append(pick)
+
+
+def _pick_arrays(book):
+    if book["arrays"] is None:
+        book["arrays"] = {
+            "rosters": np.array(book["pick_rosters"], dtype=np.int64),
+            "players": np.array(book["pick_players"], dtype=np.int64),
+            "roles": np.array(book["pick_roles"], dtype=np.int64),
+        }
+    return book["arrays"]
+
+
+def _score_rows(book, players_dict, rows):
+    scores = np.zeros((len(rows), len(ROSTER_ROLES)))
+    for i, row in enumerate(rows):
+        team_name, player_name = book["players"][row]
+        data = players_dict.get(team_name, {}).get(player_name)
+        if data is None:
+            continue
+        player_scores = data.get("scores", {})
+        for j, role in enumerate(ROSTER_ROLES):
+            scores[i, j] = player_scores.get(role, 0)
+    return scores
+
+
+def compute_roster_totals(book, players_dict):
+    """Recompute every roster total from calculate_all_scores output in one sparse product."""
+    book["scores"] = _score_rows(book, players_dict, range(len(book["players"])))
+    arrays = _pick_arrays(book)
+
+    pick_scores = book["scores"][arrays["players"], arrays["roles"]]
+    book["totals"] = np.bincount(
+        arrays["rosters"], weights=pick_scores, minlength=len(book["rosters"])
+    )
+    return book
+
+
+def update_roster_totals(book, players_dict, changed_players):
+    """
+    Update only the rosters that pick one of changed_players, a list of (team, player).
+    A player listed more than once is only counted once.
+
+    Falls back to compute_roster_totals when rosters were added or replaced
+    since the last computation.
+    """
+    if book["arrays"] is None or len(book["totals"]) != len(book["rosters"]):
+        return compute_roster_totals(book, players_dict)
+
+    rows = np.unique(
+        np.array(
+            [book["player_index"][key] for key in changed_players if key in book["player_index"]],
+            dtype=np.int64,
+        )
+    )
+    if not len(rows):
+        return book
+
+    new_scores = _score_rows(book, players_dict, rows)
+    deltas = new_scores - book["scores"][rows]
+    book["scores"][rows] = new_scores
+
+    picks = []
+    pick_deltas = []
+    for i, row in enumerate(rows.tolist()):
+        for pick in book["player_picks"][row]:
+            picks.append(pick)
+            pick_deltas.append(deltas[i, book["pick_roles"][pick]])
+
+    if picks:
+        np.add.at(book["totals"], book["arrays"]["rosters"][picks], pick_deltas)
+    return book
+
+
+def roster_total(book, roster_id):
+    """Current fantasy total of one roster."""
+    return float(book["totals"][book["roster_index"][roster_id]])
+
+
+def roster_totals(book):
+    """Current fantasy totals of every roster, keyed by roster id."""
+    return {roster_id: float(total) for roster_id, total in zip(book["rosters"], book["totals"])}
@@ -0,0 +1,153 @@
+import heapq
+import json
+import math
+import os
+from bisect import bisect_left
+from collections import Counter
+
+from .player_identity import normalize_player_name, name_trigrams
+
+
+SEARCH_INDEX_VERSION = 1
+
+
+def _terms(normalized):
+    """Full name plus each word, so "smi" finds "John Smith"."""
+    words = normalized.split()
+    return {normalized, *words} if words else set()
+
+
+def build_search_index(players_dict):
+    """
+    Prefix and trigram index over player and team names.
+
+    entries are [kind, team, player] ("team" entries have no player). The
+    prefix index is a sorted array of (term, entry id) pairs searched with
+    bisect, which answers the same queries as a trie in a flat, quick to load
+    form. grams maps each trigram to the ids containing it, for typo-tolerant
+    lookups.
+    """
+    entries = []
+    names = []
+    for team_name in sorted(players_dict):
+        entries.append(["team", team_name, None])
+        names.append(normalize_player_name(team_name))
+        for player_name in sorted(players_dict[team_name]):
+            entries.append(["player", team_name, player_name])
+            names.append(normalize_player_name(player_name))
+
+    pairs = sorted(
+        (term, entry_id) for entry_id, name in enumerate(names) for term in _terms(name)
+    )
+
+    grams = {}
+    gram_counts = []
+    for entry_id, name in enumerate(names):
+        entry_grams = name_trigrams(name)
+        gram_counts.append(len(entry_grams))
+        for gram in entry_grams:
+            grams.setdefault(gram, []).append(entry_id)
+
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "entries": entries,
+        "names": names,
+        "terms": [term for term, _ in pairs],
+        "term_ids": [entry_id for _, entry_id in pairs],
+        "grams": grams,
+        "gram_counts": gram_counts,
+    }
+
+
+def save_search_index(index, path="search_index.json"):
+    """Write the index as compact JSON, replacing any previous file in one step."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_search_index(path="search_index.json"):
+    with open(path) as f:
+        index = json.load(f)
+    if index.get("version") != SEARCH_INDEX_VERSION:
+        raise ValueError(f"Unsupported search index version: {index.get('version')}")
+    return index
+
+
+def _result(index, entry_id, score):
+    kind, team_name, player_name = index["entries"][entry_id]
+    return {"kind": kind, "team": team_name, "player": player_name, "score": score}
+
+
+def search_prefix(index, query, limit=10, kind=None):
+    """
+    Entries with a name or word starting with query.
+
+    Matches come in term order (an exact term before its longer completions),
+    and the scan stops as soon as limit entries are found.
+    """
+    query = normalize_player_name(query)
+    if not query:
+        return []
+
+    terms = index["terms"]
+    term_ids = index["term_ids"]
+    entries = index["entries"]
+    found = []
+    seen = set()
+    i = bisect_left(terms, query)
+    while i < len(terms) and len(found) < limit and terms[i].startswith(query):
+        entry_id = term_ids[i]
+        if entry_id not in seen and (kind is None or entries[entry_id][0] == kind):
+            seen.add(entry_id)
+            found.append(entry_id)
+        i += 1
+
+    return [_result(index, entry_id, 1.0) for entry_id in found]
+
+
+def search_fuzzy(index, query, limit=10, min_similarity=0.3, kind=None):
+    """
+    Entries whose names share enough trigrams with query (Jaccard similarity).
+
+    Shared trigram counts come from merging the query's posting lists; an
+    entry reaching min_similarity shares at least min_similarity * n of the
+    query's n trigrams, so everything below that is skipped before scoring.
+    """
+    query_grams = name_trigrams(normalize_player_name(query))
+    if not query_grams:
+        return []
+
+    grams = index["grams"]
+    shared_counts = Counter()
+    for gram in query_grams:
+        shared_counts.update(grams.get(gram, ()))
+
+    needed = max(1, math.ceil(min_similarity * len(query_grams)))
+    entries = index["entries"]
+    gram_counts = index["gram_counts"]
+    scored = []
+    for entry_id, shared in shared_counts.items():
+        if shared < needed or (kind is not None and entries[entry_id][0] != kind):
+            continue
+        similarity = shared / (len(query_grams) + gram_counts[entry_id] - shared)
+        if similarity >= min_similarity:
+            scored.append((-similarity, entry_id))
+
+    best = heapq.nsmallest(limit, scored)
+    return [_result(index, entry_id, -neg) for neg, entry_id in best]
+
+
+def search_players(index, query, limit=10, kind=None):
+    """Autocomplete: prefix matches first, topped up with fuzzy matches."""
+    results = search_prefix(index, query, limit, kind)
+    if len(results) < limit:
+        seen = {(r["kind"], r["team"], r["player"]) for r in results}
+        for result in search_fuzzy(index, query, limit, kind=kind):
+            if (result["kind"], result["team"], result["player"]) not in seen:
+                results.append(result)
+                if len(results) == limit:
+                    break
+    return results
@@ -0,0 +1,300 @@
+import hashlib
+import sqlite3
+from collections import Counter
+
+from .get_stats import set_derived_stats
+from .player_identity import player_name, resolve_player
+
+
+# Columns that identify an event within a team's export. Re-ingesting the same
+# export (or a newer export that contains it) produces the same keys, so events
+# are only stored once. Names are keyed as written in the export, so rows must
+# be ingested before resolve_csv_names: adding an alias later must not change
+# the keys of events already stored.
+EVENT_IDENTITY_COLUMNS = [
+    "Date/Time",
+    "Tournamemnt",
+    "Opponent",
+    "Our Score - End of Point",
+    "Their Score - End of Point",
+    "Elapsed Time (secs)",
+    "Event Type",
+    "Action",
+    "Passer",
+    "Receiver",
+    "Defender",
+]
+
+WAREHOUSE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    event_key TEXT NOT NULL UNIQUE,
+    team TEXT NOT NULL,
+    tournament TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    action TEXT NOT NULL,
+    passer TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    defender TEXT NOT NULL,
+    line TEXT NOT NULL DEFAULT '',
+    event_type TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS event_lines (
+    seq INTEGER NOT NULL REFERENCES events(seq),
+    team TEXT NOT NULL,
+    tournament TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    player TEXT NOT NULL,
+    PRIMARY KEY (seq, player)
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_team_tournament
+    ON events(team, tournament, game_date, action);
+CREATE INDEX IF NOT EXISTS idx_events_team_date
+    ON events(team, game_date, action);
+CREATE INDEX IF NOT EXISTS idx_event_lines_team_tournament
+    ON event_lines(team, tournament, game_date, player, opponent);
+CREATE INDEX IF NOT EXISTS idx_event_lines_team_date
+    ON event_lines(team, game_date, player);
+"""
+
+
+# Columns added to events after the first release, with their definitions
+EVENT_COLUMN_UPGRADES = {
+    "line": "TEXT NOT NULL DEFAULT ''",
+    "event_type": "TEXT NOT NULL DEFAULT ''",
+}
+
+
+def open_warehouse(path="warehouse.db"):
+    """Open (and create if needed) the local event warehouse."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(WAREHOUSE_SCHEMA)
+
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    for column, definition in EVENT_COLUMN_UPGRADES.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE events ADD COLUMN {column} {definition}")
+    return conn
+
+
+def event_key(team_name, row, occurrence):
+    """Hash the identity of an event row; occurrence separates identical rows."""
+    parts = [team_name, str(occurrence)]
+    parts.extend(str(row.get(column, "")) for column in EVENT_IDENTITY_COLUMNS)
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def ingest_team_events(conn, team_name, whole_csv):
+    """
+    Store a team's export rows in the warehouse, skipping events already stored.
+
+    whole_csv must hold the names as written in the export (not rewritten by
+    resolve_csv_names); set_players_stats_from_warehouse merges spellings when
+    reading.
+    """
+    occurrences = Counter()
+    inserted = 0
+
+    with conn:
+        cursor = conn.cursor()
+        for row in whole_csv:
+            identity = tuple(row.get(column, "") for column in EVENT_IDENTITY_COLUMNS)
+            occurrences[identity] += 1
+            key = event_key(team_name, row, occurrences[identity])
+
+            tournament = row.get("Tournamemnt", "").strip()
+            opponent = row.get("Opponent", "")
+            game_date = row.get("Date/Time", "")[:10]
+
+            cursor.execute(
+                "INSERT OR IGNORE INTO events "
+                "(event_key, team, tournament, opponent, game_date, action, passer, receiver, defender, "
+                "line, event_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    team_name,
+                    tournament,
+                    opponent,
+                    game_date,
+                    row.get("Action", ""),
+                    row.get("Passer", ""),
+                    row.get("Receiver", ""),
+                    row.get("Defender", ""),
+                    row.get("Line", ""),
+                    row.get("Event Type", ""),
+                ),
+            )
+            if cursor.rowcount != 1:
+                continue
+
+            inserted += 1
+            seq = cursor.lastrowid
+            for i in range(7):
+                name = row.get(f"Player {i}", "")
+                if name:
+                    cursor.execute(
+                        "INSERT OR IGNORE INTO event_lines "
+                        "(seq, team, tournament, opponent, game_date, player) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (seq, team_name, tournament, opponent, game_date, name),
+                    )
+
+    return inserted
+
+
+def list_warehouse_tournaments(conn, team_name=None):
+    """List the tournaments stored in the warehouse, optionally for one team."""
+    if team_name is None:
+        rows = conn.execute("SELECT DISTINCT tournament FROM events WHERE tournament != ''")
+    else:
+        rows = conn.execute(
+            "SELECT DISTINCT tournament FROM events WHERE team = ? AND tournament != ''",
+            (team_name,),
+        )
+    return sorted(row[0] for row in rows)
+
+
+def _event_filter(team_name, tournaments, start_date, end_date, prefix=""):
+    """Build the WHERE clause shared by the aggregate queries."""
+    clauses = [f"{prefix}team = ?"]
+    params = [team_name]
+
+    if tournaments:
+        clauses.append(f"{prefix}tournament IN ({', '.join('?' for _ in tournaments)})")
+        params.extend(tournaments)
+    if start_date:
+        clauses.append(f"{prefix}game_date >= ?")
+        params.append(start_date)
+    if end_date:
+        clauses.append(f"{prefix}game_date <= ?")
+        params.append(end_date)
+
+    return " AND ".join(clauses), params
+
+
+def set_players_stats_from_warehouse(
+    players_dict, team_name, conn, tournaments=None, start_date=None, end_date=None,
+    identity_index=None,
+):
+    """
+    Same aggregates as set_players_stats, read from the warehouse.
+
+    tournaments, start_date and end_date (YYYY-MM-DD, inclusive) narrow the
+    events; an empty tournaments list includes every tournament. The warehouse
+    stores names as written in the exports; with identity_index, each is
+    resolved to its canonical spelling and the counts of one player's
+    spellings are added together, matching players_dict after
+    resolve_csv_names.
+    """
+    canonical = {}
+
+    def resolve(name):
+        if identity_index is None:
+            return name
+        resolved = canonical.get(name)
+        if resolved is None:
+            resolved = player_name(identity_index, resolve_player(identity_index, team_name, name))
+            canonical[name] = resolved
+        return resolved
+
+    for player in players_dict[team_name]:
+        players_dict[team_name][player] = {
+            "assists": 0,
+            "goals": 0,
+            "ds": 0,
+            "turnovers": 0,
+            "tournamemnts": {},
+            "games_played": 0,
+            "questionable": False,
+            "plus_minus": 0,
+            "points_played": 0,
+            "o_points": 0,
+            "d_points": 0,
+            "holds": 0,
+            "breaks": 0,
+            "hold_pct": 0.0,
+            "break_pct": 0.0,
+        }
+
+    where, params = _event_filter(team_name, tournaments, start_date, end_date)
+
+    stat_rows = conn.execute(
+        f"""
+        SELECT player, stat, COUNT(*) FROM (
+            SELECT passer AS player,
+                   CASE action WHEN 'Goal' THEN 'assists' ELSE 'turnovers' END AS stat
+            FROM events WHERE {where} AND action IN ('Goal', 'Throwaway')
+            UNION ALL
+            SELECT receiver AS player,
+                   CASE action WHEN 'Goal' THEN 'goals' ELSE 'turnovers' END AS stat
+            FROM events WHERE {where} AND action IN ('Goal', 'Drop')
+            UNION ALL
+            SELECT defender AS player, 'ds' AS stat
+            FROM events WHERE {where} AND action = 'D'
+        )
+        GROUP BY player, stat
+        """,
+        params * 3,
+    )
+    for player, stat, count in stat_rows:
+        player = resolve(player)
+        if player in players_dict[team_name]:
+            players_dict[team_name][player][stat] += count
+
+    # Games played: distinct opponents per tournament, in the order first seen
+    game_rows = conn.execute(
+        f"""
+        SELECT player, tournament, opponent, MIN(seq) AS first_seq
+        FROM event_lines WHERE {where}
+        GROUP BY player, tournament, opponent
+        ORDER BY first_seq
+        """,
+        params,
+    )
+    for player, tourney, opponent, _ in game_rows:
+        player = resolve(player)
+        if player in players_dict[team_name]:
+            opponents = players_dict[team_name][player]["tournamemnts"].setdefault(tourney, [])
+            if opponent not in opponents:
+                opponents.append(opponent)
+
+    # Points played: the line on each point's goal row, split by O/D line
+    line_where, line_params = _event_filter(
+        team_name, tournaments, start_date, end_date, prefix="l."
+    )
+    point_rows = conn.execute(
+        f"""
+        SELECT l.player,
+               COUNT(*),
+               SUM(e.line = 'O'),
+               SUM(e.line = 'D'),
+               SUM(e.line = 'O' AND e.event_type = 'Offense'),
+               SUM(e.line = 'D' AND e.event_type = 'Offense')
+        FROM event_lines l JOIN events e ON e.seq = l.seq
+        WHERE {line_where} AND e.action = 'Goal'
+        GROUP BY l.player
+        """,
+        line_params,
+    )
+    for player, points, o_points, d_points, holds, breaks in point_rows:
+        player = resolve(player)
+        if player in players_dict[team_name]:
+            stats = players_dict[team_name][player]
+            stats["points_played"] += points
+            stats["o_points"] += o_points
+            stats["d_points"] += d_points
+            stats["holds"] += holds
+            stats["breaks"] += breaks
+
+    for player in players_dict[team_name].values():
+        for tourney in player["tournamemnts"].values():
+            player["games_played"] += len(tourney)
+        set_derived_stats(player)
+
+    return players_dict
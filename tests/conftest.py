@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# The scripts import their helpers as top-level modules, the same way
+# main.py (utils.calculations) and pull_data.py (fetch_scheduler, ...) do
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root / "scripts"))
+sys.path.insert(0, str(root / "live_pulling"))
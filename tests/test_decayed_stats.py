@@ -0,0 +1,60 @@
+from utils.calculations import (
+    create_decayed_aggregator,
+    decayed_player_stats,
+    set_players_stats,
+    update_decayed_stats,
+)
+
+LINE = ["Ann", "Bea", "Cat", "Dee", "Eve", "Fay", "Gil"]
+
+
+def row(date_time, opponent, action="Goal", passer="Ann", receiver="Bea", tournament="Cowbell"):
+    data = {
+        "Date/Time": date_time,
+        "Tournamemnt": tournament,
+        "Opponent": opponent,
+        "Action": action,
+        "Passer": passer,
+        "Receiver": receiver,
+        "Defender": "",
+        "Line": "O",
+        "Event Type": "Offense",
+    }
+    data.update({f"Player {i}": name for i, name in enumerate(LINE)})
+    return data
+
+
+def test_rows_without_dates_before_any_dated_row():
+    aggregator = create_decayed_aggregator(half_life=10)
+    rows = [row("", "Tigers"), row("not a date", "Tigers"), row("2024-03-01 10:00", "Tigers")]
+
+    assert update_decayed_stats(aggregator, "Auburn", rows) == 3
+
+    stats = decayed_player_stats(aggregator, "Auburn", "Bea")
+    assert stats["goals"] == 3
+    assert stats["games_played"] == 1
+
+
+def test_undated_rows_only():
+    aggregator = create_decayed_aggregator(half_life=10)
+    update_decayed_stats(aggregator, "Auburn", [row("", "Tigers")])
+
+    assert decayed_player_stats(aggregator, "Auburn", "Ann")["assists"] == 1.0
+
+
+def test_games_played_matches_raw_count():
+    # Same opponent twice in one tournament (two days) is one game, as in
+    # set_players_stats; the same opponent in another tournament is another
+    rows = [
+        row("2024-03-01 10:00", "Tigers"),
+        row("2024-03-01 13:00", "Rebels"),
+        row("2024-03-02 09:00", "Tigers"),
+        row("2024-04-01 09:00", "Tigers", tournament="Spring"),
+    ]
+    aggregator = create_decayed_aggregator(half_life=1e9)
+    update_decayed_stats(aggregator, "Auburn", rows)
+
+    players_dict = set_players_stats({"Auburn": {name: {} for name in LINE}}, "Auburn", rows)
+    for name in LINE:
+        decayed = decayed_player_stats(aggregator, "Auburn", name)
+        assert round(decayed["games_played"], 6) == players_dict["Auburn"][name]["games_played"] == 3
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from fetch_scheduler import create_token_bucket, fetch_team_exports, save_fetch_state
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.status_code = 200
+        self.ok = True
+        self.text = text
+        self.headers = {"content-type": "text/csv"}
+
+
+class FakeSession:
+    def __init__(self, exports):
+        self.exports = exports
+        self.requested = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requested.append(url)
+        return FakeResponse(self.exports[url])
+
+
+def test_exports_come_back_in_export_order_not_fetch_order(tmp_path):
+    export_urls = {"Auburn": "https://example.com/auburn", "Alabama": "https://example.com/alabama"}
+    exports = {
+        "https://example.com/auburn": "Date/Time,Action\n2024-01-01 10:00,Goal\n",
+        "https://example.com/alabama": "Date/Time,Action\n2024-01-02 10:00,Goal\n",
+    }
+    now = time.time()
+    # Auburn has been idle for a day, Alabama changed a minute ago, so
+    # Alabama is downloaded first
+    save_fetch_state(
+        {
+            "Auburn": {"url": export_urls["Auburn"], "last_checked": now - 60, "last_changed": now - 86400},
+            "Alabama": {"url": export_urls["Alabama"], "last_checked": now - 60, "last_changed": now - 60},
+        },
+        tmp_path,
+    )
+    session = FakeSession(exports)
+
+    csv_data_dict = fetch_team_exports(
+        export_urls, state_dir=tmp_path, bucket=create_token_bucket(rate=1000, capacity=10), session=session
+    )
+
+    assert session.requested == [export_urls["Alabama"], export_urls["Auburn"]]
+    assert list(csv_data_dict) == ["Auburn", "Alabama"]
+    assert csv_data_dict["Auburn"] == exports[export_urls["Auburn"]]
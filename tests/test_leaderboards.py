@@ -0,0 +1,57 @@
+import random
+from bisect import bisect_left
+
+from utils.calculations import (
+    LEADERBOARD_ROLES,
+    build_leaderboards,
+    leaderboard_size,
+    leaderboard_slice,
+    rank_of_player,
+    update_leaderboard_players,
+)
+from utils.calculations import leaderboards
+
+
+def random_player(rng):
+    return {"price": rng.randint(3, 6), "scores": {"captain_score": rng.randint(0, 5)}}
+
+
+def test_updates_match_a_sorted_list(monkeypatch):
+    # Tiny blocks so updates split and drop blocks all the time
+    monkeypatch.setattr(leaderboards, "LEADERBOARD_BLOCK_SIZE", 2)
+    rng = random.Random(0)
+    players_dict = {"Auburn": {}, "Alabama": {}}
+    for i in range(30):
+        players_dict[rng.choice(list(players_dict))][f"Player {i}"] = random_player(rng)
+    boards = build_leaderboards({}, "Cowbell", players_dict)
+
+    for _ in range(500):
+        team_name = rng.choice(list(players_dict))
+        player_name = f"Player {rng.randint(0, 40)}"
+        if rng.random() < 0.3:
+            players_dict[team_name].pop(player_name, None)
+        else:
+            players_dict[team_name][player_name] = random_player(rng)
+        update_leaderboard_players(boards, "Cowbell", players_dict, [(team_name, player_name)])
+
+        for role in LEADERBOARD_ROLES:
+            expected = sorted(
+                leaderboards._entry(data, role, t, p)
+                for t, players in players_dict.items()
+                for p, data in players.items()
+            )
+            offset = rng.randint(0, len(expected))
+            page = leaderboard_slice(boards, "Cowbell", role, offset, 7)
+
+            assert leaderboard_size(boards, "Cowbell", role) == len(expected)
+            assert [(e["team"], e["player"]) for e in page] == [
+                (t, p) for _, t, p in expected[offset:offset + 7]
+            ]
+            if player_name in players_dict[team_name]:
+                data = players_dict[team_name][player_name]
+                entry = leaderboards._entry(data, role, team_name, player_name)
+                assert rank_of_player(boards, "Cowbell", role, team_name, player_name) == (
+                    bisect_left(expected, (entry[0],)) + 1
+                )
+            else:
+                assert rank_of_player(boards, "Cowbell", role, team_name, player_name) is None
@@ -0,0 +1,59 @@
+import itertools
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from utils.calculations import DEFAULT_LINEUP_SLOTS, solve_optimal_lineups
+from utils.calculations.optimal_lineups import _candidate_players
+
+ROLES = ["captain_score", "handler_score", "cutter_score", "defender_score"]
+
+
+def make_players(count, seed):
+    rng = random.Random(seed)
+    players_dict = {}
+    for i in range(count):
+        players_dict.setdefault(f"Team {i % 40}", {})[f"Player {i}"] = {
+            "price": rng.randint(3, 25),
+            "scores": {role: rng.uniform(0, 30) for role in ROLES},
+        }
+    return players_dict
+
+
+def brute_force_totals(players_dict, slots, budget, top_n):
+    players = [data for team in players_dict.values() for data in team.values()]
+    roles = [role for role, count in slots.items() for _ in range(count)]
+    totals = set()
+    for chosen in itertools.permutations(range(len(players)), len(roles)):
+        if sum(players[i]["price"] for i in chosen) > budget:
+            continue
+        lineup = frozenset(zip(chosen, roles))
+        totals.add((round(sum(players[i]["scores"][role] for i, role in lineup), 9), lineup))
+    return sorted((total for total, _ in totals), reverse=True)[:top_n]
+
+
+def test_matches_brute_force():
+    players_dict = make_players(9, seed=3)
+    slots = {"handler_score": 2, "cutter_score": 1}
+
+    lineups = solve_optimal_lineups(players_dict, budget=40, slots=slots, top_n=4)
+
+    assert [round(lineup["total"], 9) for lineup in lineups] == brute_force_totals(
+        players_dict, slots, 40, 4
+    )
+
+
+@pytest.mark.parametrize("top_n", [1, 5])
+def test_thousands_of_players_prune_to_a_small_dp(top_n):
+    players_dict = make_players(2000, seed=0)
+
+    candidates = _candidate_players(players_dict, DEFAULT_LINEUP_SLOTS, 100, top_n, False)
+    lineups = solve_optimal_lineups(players_dict, top_n=top_n)
+
+    # Only the price/score frontier of each role reaches the DP
+    assert len(candidates) < 200
+    assert len(lineups) == top_n
+    assert all(lineup["cost"] <= 100 for lineup in lineups)
+    assert set(candidates) >= {(p["team"], p["player"]) for l in lineups for p in l["picks"]}